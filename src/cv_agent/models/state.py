@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Any
+import operator
+from typing import Annotated, Dict, List, Optional, Any
 from pydantic import BaseModel
 from typing_extensions import TypedDict
 
@@ -36,6 +37,7 @@ class CVState(TypedDict):
     """State management for CV processing workflow."""
     # Input data
     original_cv: str
+    raw_bytes: Optional[bytes]  # In-memory upload content, used instead of original_cv when set
     file_format: str  # 'pdf', 'docx', 'txt'
     target_role: Optional[str]
     target_industry: Optional[str]
@@ -46,7 +48,7 @@ class CVState(TypedDict):
     
     # Analysis results
     analysis_scores: Optional[AnalysisScore]
-    identified_gaps: List[str]
+    identified_gaps: Annotated[List[str], operator.add]  # Appended by parallel analysis nodes
     
     # Improvements
     suggested_improvements: List[Improvement]
@@ -55,8 +57,10 @@ class CVState(TypedDict):
     # Output
     enhanced_cv: Optional[str]
     enhancement_summary: Optional[str]
+    final_quality_score: Optional[float]
+    processing_complete: bool
     
     # Metadata
-    processing_errors: List[str]
+    processing_errors: Annotated[List[str], operator.add]  # Nodes return only new errors
     processing_time: Optional[float]
     model_used: Optional[str]
\ No newline at end of file
@@ -37,9 +37,8 @@ def analyze_quality_node(state: CVState) -> Dict[str, Any]:
         # Identify gaps and weaknesses
         identified_gaps = analyzer.identify_gaps(sections)
         
-        # Update state with analysis results
+        # Return only this node's keys; it runs in parallel with match_requirements_node
         return {
-            **state,
             "analysis_scores": analysis_scores.model_dump(),
             "identified_gaps": identified_gaps
         }
@@ -47,15 +46,10 @@ def analyze_quality_node(state: CVState) -> Dict[str, Any]:
     except Exception as e:
         error_message = f"Error in analyze_quality_node: {str(e)}"
         
-        # Add error to processing errors
-        errors = state.get("processing_errors", [])
-        errors.append(error_message)
-        
+        # Lists are appended to the state by the CVState reducers
         return {
-            **state,
             "analysis_scores": None,
-            "identified_gaps": [],
-            "processing_errors": errors
+            "processing_errors": [error_message]
         }
 
 
@@ -63,11 +57,13 @@ def match_requirements_node(state: CVState) -> Dict[str, Any]:
     """
     LangGraph node for matching CV content against job/industry requirements.
     
+    Runs in parallel with analyze_quality_node, so it only sees the parsed CV.
+    
     Args:
-        state: Current CVState with analysis results
+        state: Current CVState with parsed CV content
         
     Returns:
-        Updated state with requirement matching results
+        New requirement gaps, appended to identified_gaps by the state reducer
     """
     
     try:
@@ -95,7 +91,7 @@ def match_requirements_node(state: CVState) -> Dict[str, Any]:
             ]
         }
         
-        gaps = state.get("identified_gaps", [])
+        gaps = []
         
         # Add role-specific gap analysis
         if target_role and target_role.lower() in role_keywords:
@@ -107,17 +103,12 @@ def match_requirements_node(state: CVState) -> Dict[str, Any]:
                 gaps.append(f"Consider adding keywords relevant to {target_role}: {', '.join(missing_keywords[:5])}")
         
         return {
-            **state,
             "identified_gaps": gaps
         }
         
     except Exception as e:
         error_message = f"Error in match_requirements_node: {str(e)}"
         
-        errors = state.get("processing_errors", [])
-        errors.append(error_message)
-        
         return {
-            **state,
-            "processing_errors": errors
+            "processing_errors": [error_message]
         }
\ No newline at end of file
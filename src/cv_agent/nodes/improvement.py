@@ -169,20 +169,15 @@ def generate_improvements_node(state: CVState) -> Dict[str, Any]:
         improvements_data = [imp.model_dump() for imp in all_improvements]
         
         return {
-            **state,
             "suggested_improvements": improvements_data
         }
         
     except Exception as e:
         error_message = f"Error in generate_improvements_node: {str(e)}"
         
-        errors = state.get("processing_errors", [])
-        errors.append(error_message)
-        
         return {
-            **state,
             "suggested_improvements": [],
-            "processing_errors": errors
+            "processing_errors": [error_message]
         }
 
 
@@ -239,7 +234,6 @@ def apply_improvements_node(state: CVState) -> Dict[str, Any]:
         enhancement_summary = "Applied improvements:\n" + "\n".join(summary_parts) if summary_parts else "No high-priority improvements applied"
         
         return {
-            **state,
             "applied_improvements": applied_improvements,
             "enhanced_cv": enhanced_cv,
             "enhancement_summary": enhancement_summary
@@ -248,13 +242,9 @@ def apply_improvements_node(state: CVState) -> Dict[str, Any]:
     except Exception as e:
         error_message = f"Error in apply_improvements_node: {str(e)}"
         
-        errors = state.get("processing_errors", [])
-        errors.append(error_message)
-        
         return {
-            **state,
             "applied_improvements": [],
             "enhanced_cv": state.get("raw_text", ""),
             "enhancement_summary": f"Error applying improvements: {str(e)}",
-            "processing_errors": errors
+            "processing_errors": [error_message]
         }
\ No newline at end of file
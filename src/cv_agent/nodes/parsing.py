@@ -6,24 +6,42 @@ from ..models.state import CVState
 from ..tools.parsers import ParserFactory
 
 
+def _source_name(state: CVState) -> str:
+    """Return the file name whose suffix selects the parser for the CV source."""
+    if state.get("raw_bytes"):
+        return f"upload.{state.get('file_format') or 'txt'}"
+    return state["original_cv"]
+
+
+def _parse_source(parser, state: CVState, file_path: str) -> str:
+    """Read raw text from in-memory upload bytes or from the file path."""
+    if state.get("raw_bytes"):
+        return parser.parse_bytes(state["raw_bytes"], name=file_path)
+    return parser.parse(file_path)
+
+
 def parse_cv_node(state: CVState) -> Dict[str, Any]:
     """
     LangGraph node for parsing CV documents and extracting structured content.
     Enhanced with Docling parser and LLM-based section extraction for superior document understanding.
     
     Args:
-        state: Current CVState containing the original CV path or content
+        state: Current CVState containing the original CV path, content or uploaded bytes
         
     Returns:
-        Updated state with parsed sections and raw text
+        Only the fields this node sets; LangGraph merges them into the state
     """
+    # The agent fills in a cached parse of the same CV; nothing left to do
+    if state.get("raw_text") and state.get("parsed_sections"):
+        return {"processing_errors": []}
+    
     start_time = time.time()
     
     try:
-        # Determine if we have a file path or raw content
-        if state.get("original_cv", "").startswith("/") or state.get("original_cv", "").startswith("./"):
-            # It's a file path
-            file_path = state["original_cv"]
+        # Determine if we have uploaded bytes, a file path or raw content
+        if state.get("raw_bytes") or state.get("original_cv", "").startswith("/") or state.get("original_cv", "").startswith("./"):
+            # It's a document; in-memory uploads get a synthetic name carrying their format
+            file_path = _source_name(state)
             
             # Determine file format
             suffix = Path(file_path).suffix.lower()
@@ -40,7 +58,7 @@ def parse_cv_node(state: CVState) -> Dict[str, Any]:
                 parser = ParserFactory.create_parser(file_path, use_docling=False, use_llm=use_llm)
             
             # Parse the document
-            raw_text = parser.parse(file_path)
+            raw_text = _parse_source(parser, state, file_path)
             parsed_sections = parser.extract_sections(raw_text)
             
         else:
@@ -63,7 +81,6 @@ def parse_cv_node(state: CVState) -> Dict[str, Any]:
         print(f"Extracted {len(parsed_sections)} sections: {list(parsed_sections.keys())}")
         
         return {
-            **state,
             "raw_text": raw_text,
             "file_format": file_format,
             "parsed_sections": {name: section.model_dump() for name, section in parsed_sections.items()},
@@ -76,18 +93,17 @@ def parse_cv_node(state: CVState) -> Dict[str, Any]:
         error_message = f"Error in parse_cv_node: {str(e)}"
         
         # Try fallback parsing if Docling fails
-        if "docling" in str(e).lower() and state.get("original_cv", "").startswith("/"):
+        if "docling" in str(e).lower() and (state.get("raw_bytes") or state.get("original_cv", "").startswith("/")):
             try:
                 print("Docling parsing failed, attempting fallback to traditional parsers...")
-                file_path = state["original_cv"]
+                file_path = _source_name(state)
                 parser = ParserFactory.create_parser(file_path, use_docling=False, use_llm=True)  # Still use LLM if available
-                raw_text = parser.parse(file_path)
+                raw_text = _parse_source(parser, state, file_path)
                 parsed_sections = parser.extract_sections(raw_text)
                 
                 processing_time = time.time() - start_time
                 
                 return {
-                    **state,
                     "raw_text": raw_text,
                     "file_format": Path(file_path).suffix.lower()[1:],
                     "parsed_sections": {name: section.model_dump() for name, section in parsed_sections.items()},
@@ -98,7 +114,6 @@ def parse_cv_node(state: CVState) -> Dict[str, Any]:
                 error_message = f"Both Docling and fallback parsing failed: {str(e)}, {str(fallback_error)}"
         
         return {
-            **state,
             "raw_text": "",
             "file_format": "unknown",
             "parsed_sections": {},
@@ -3,41 +3,80 @@ from typing import Dict, List, Set
 from ..models.state import CVSection, AnalysisScore
 
 
+# Common industry keywords for different domains; lowercase, and may be multi-word phrases
+# (see INDUSTRY_KEYWORD_PATTERNS for how they are matched)
+INDUSTRY_KEYWORDS = {
+    'technology': frozenset([
+        'python', 'java', 'javascript', 'react', 'node.js', 'aws', 'docker', 
+        'kubernetes', 'sql', 'mongodb', 'api', 'microservices', 'agile', 
+        'scrum', 'git', 'ci/cd', 'devops', 'machine learning', 'ai'
+    ]),
+    'marketing': frozenset([
+        'seo', 'sem', 'google analytics', 'social media', 'content marketing',
+        'campaign management', 'lead generation', 'conversion optimization',
+        'brand management', 'market research', 'digital marketing'
+    ]),
+    'finance': frozenset([
+        'financial analysis', 'budgeting', 'forecasting', 'excel', 'financial modeling',
+        'risk management', 'compliance', 'audit', 'tax', 'investment analysis'
+    ])
+}
+
+# One alternation per industry so keyword density is a single pass over the content; keywords
+# match as whole words (plurals allowed) and the group yields the keyword itself
+INDUSTRY_KEYWORD_PATTERNS = {
+    industry: re.compile(
+        r'\b(' + '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)) + r')s?\b'
+    )
+    for industry, keywords in INDUSTRY_KEYWORDS.items()
+}
+
+# ATS-friendly formatting patterns, compiled once at import with the flags each check needs
+ATS_PATTERNS = {
+    'bullet_points': re.compile(r'[•·▪▫◦‣⁃]|\*\s|\-\s|^\d+\.\s', re.MULTILINE),
+    'dates': re.compile(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|\d{1,2}\/\d{1,2}\/\d{2,4}|\d{4})\b', re.IGNORECASE),
+    'phone': re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+}
+
+SECTION_HEADER_PATTERNS = [
+    re.compile(rf'\b{header}\b', re.IGNORECASE)
+    for header in ('experience', 'education', 'skills', 'summary', 'contact',
+                   'projects', 'certifications', 'achievements')
+]
+
+ACTION_VERBS = (
+    'achieved', 'developed', 'managed', 'led', 'created', 'implemented',
+    'improved', 'increased', 'reduced', 'optimized', 'delivered',
+    'collaborated', 'designed', 'built', 'analyzed', 'executed'
+)
+
+# One pass over the content finds every action verb; matched as whole words
+ACTION_VERB_PATTERN = re.compile(r'\b(?:' + '|'.join(ACTION_VERBS) + r')\b', re.IGNORECASE)
+
+QUANTIFIED_PATTERN = re.compile(r'\b\d+%|\b\d+\s*(million|thousand|k|m)\b|\$\d+|\b\d+\+\b', re.IGNORECASE)
+
+
 class CVAnalyzer:
     """Analyzer for CV content quality and ATS compatibility."""
     
     def __init__(self):
-        # Common industry keywords for different domains
-        self.industry_keywords = {
-            'technology': [
-                'python', 'java', 'javascript', 'react', 'node.js', 'aws', 'docker', 
-                'kubernetes', 'sql', 'mongodb', 'api', 'microservices', 'agile', 
-                'scrum', 'git', 'ci/cd', 'devops', 'machine learning', 'ai'
-            ],
-            'marketing': [
-                'seo', 'sem', 'google analytics', 'social media', 'content marketing',
-                'campaign management', 'lead generation', 'conversion optimization',
-                'brand management', 'market research', 'digital marketing'
-            ],
-            'finance': [
-                'financial analysis', 'budgeting', 'forecasting', 'excel', 'financial modeling',
-                'risk management', 'compliance', 'audit', 'tax', 'investment analysis'
-            ]
-        }
-        
-        # ATS-friendly formatting patterns
-        self.ats_patterns = {
-            'bullet_points': r'[•·▪▫◦‣⁃]|\*\s|\-\s|^\d+\.\s',
-            'dates': r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|\d{1,2}\/\d{1,2}\/\d{2,4}|\d{4})\b',
-            'phone': r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        }
+        # Common industry keywords for different domains (shared, immutable)
+        self.industry_keywords = INDUSTRY_KEYWORDS
+        
+        # ATS-friendly formatting patterns (shared, precompiled)
+        self.ats_patterns = ATS_PATTERNS
     
     def analyze_content_quality(self, sections: Dict[str, CVSection]) -> Dict[str, float]:
         """Analyze content quality for each section."""
         scores = {}
         
         for section_name, section in sections.items():
+            # Empty sections score zero; skip the scans
+            if not section.content or section.content.isspace():
+                scores[section_name] = 0.0
+                continue
+            
             content = section.content.lower()
             score = 0.0
             
@@ -50,18 +89,12 @@ class CVAnalyzer:
             else:
                 score += min(word_count / 30, 1.0) * 0.3
             
-            # Action verbs check
-            action_verbs = [
-                'achieved', 'developed', 'managed', 'led', 'created', 'implemented',
-                'improved', 'increased', 'reduced', 'optimized', 'delivered',
-                'collaborated', 'designed', 'built', 'analyzed', 'executed'
-            ]
-            action_verb_count = sum(1 for verb in action_verbs if verb in content)
+            # Action verbs check (distinct verbs used)
+            action_verb_count = len(set(ACTION_VERB_PATTERN.findall(content)))
             score += min(action_verb_count / 5, 1.0) * 0.3
             
             # Quantified achievements check
-            numbers_pattern = r'\b\d+%|\b\d+\s*(million|thousand|k|m)\b|\$\d+|\b\d+\+\b'
-            quantified_count = len(re.findall(numbers_pattern, content, re.IGNORECASE))
+            quantified_count = len(QUANTIFIED_PATTERN.findall(content))
             score += min(quantified_count / 3, 1.0) * 0.4
             
             scores[section_name] = min(score, 1.0)
@@ -73,50 +106,52 @@ class CVAnalyzer:
         score = 0.0
         
         # Check for standard contact information
-        if re.search(self.ats_patterns['email'], raw_text, re.IGNORECASE):
+        if self.ats_patterns['email'].search(raw_text):
             score += 0.2
-        if re.search(self.ats_patterns['phone'], raw_text):
+        if self.ats_patterns['phone'].search(raw_text):
             score += 0.2
         
         # Check for proper date formatting
-        date_matches = len(re.findall(self.ats_patterns['dates'], raw_text, re.IGNORECASE))
+        date_matches = len(self.ats_patterns['dates'].findall(raw_text))
         score += min(date_matches / 5, 1.0) * 0.2
         
         # Check for bullet points usage
-        bullet_matches = len(re.findall(self.ats_patterns['bullet_points'], raw_text, re.MULTILINE))
+        bullet_matches = len(self.ats_patterns['bullet_points'].findall(raw_text))
         score += min(bullet_matches / 10, 1.0) * 0.2
         
         # Check for proper section headers
-        section_headers = [
-            'experience', 'education', 'skills', 'summary', 'contact',
-            'projects', 'certifications', 'achievements'
-        ]
-        header_count = sum(1 for header in section_headers 
-                          if re.search(rf'\b{header}\b', raw_text, re.IGNORECASE))
+        header_count = sum(1 for pattern in SECTION_HEADER_PATTERNS if pattern.search(raw_text))
         score += min(header_count / 5, 1.0) * 0.2
         
         return min(score, 1.0)
     
     def calculate_keyword_density(self, content: str, target_industry: str = None) -> float:
         """Calculate keyword density for industry relevance."""
-        if not target_industry or target_industry.lower() not in self.industry_keywords:
+        return self._keyword_density(content.lower(), target_industry)
+    
+    def _keyword_density(self, content_lower: str, target_industry: str = None) -> float:
+        """Keyword density over already-lowercased content."""
+        industry = target_industry.lower() if target_industry else None
+        industry_words = self.industry_keywords.get(industry)
+        if not industry_words:
             # Use general scoring if no industry specified
             return 0.5
         
-        content_lower = content.lower()
-        industry_words = self.industry_keywords[target_industry.lower()]
-        
-        found_keywords = sum(1 for keyword in industry_words if keyword in content_lower)
+        found_keywords = len(set(INDUSTRY_KEYWORD_PATTERNS[industry].findall(content_lower)))
         density = found_keywords / len(industry_words)
         
         return min(density, 1.0)
     
     def analyze_formatting(self, raw_text: str) -> float:
         """Analyze overall formatting quality."""
+        return self._formatting_score(raw_text, raw_text.lower())
+    
+    def _formatting_score(self, raw_text: str, text_lower: str) -> float:
+        """Formatting score, given the raw text and its lowercased form."""
         score = 0.0
         
         lines = raw_text.split('\n')
-        non_empty_lines = [line.strip() for line in lines if line.strip()]
+        non_empty_lines = [line for line in lines if line.strip()]
         
         # Consistent formatting check
         if len(non_empty_lines) > 10:
@@ -136,7 +171,7 @@ class CVAnalyzer:
         # Professional tone indicators
         professional_indicators = ['experience', 'skills', 'education', 'professional', 'career']
         professional_count = sum(1 for indicator in professional_indicators 
-                                if indicator in raw_text.lower())
+                                if indicator in text_lower)
         score += min(professional_count / 3, 1.0) * 0.2
         
         return min(score, 1.0)
@@ -179,11 +214,12 @@ class CVAnalyzer:
                               raw_text: str, target_industry: str = None) -> AnalysisScore:
         """Generate comprehensive analysis score for the CV."""
         
-        # Calculate individual scores
+        # Calculate individual scores; the lowercased text is shared by the keyword and formatting checks
+        text_lower = raw_text.lower()
         section_scores = self.analyze_content_quality(sections)
         ats_score = self.check_ats_compatibility(raw_text)
-        keyword_score = self.calculate_keyword_density(raw_text, target_industry)
-        formatting_score = self.analyze_formatting(raw_text)
+        keyword_score = self._keyword_density(text_lower, target_industry)
+        formatting_score = self._formatting_score(raw_text, text_lower)
         
         # Calculate overall score (weighted average)
         content_weight = 0.4
@@ -1,11 +1,18 @@
 import re
+from io import BytesIO
 from typing import Dict, Optional, List
 from pathlib import Path
 import PyPDF2
 from docx import Document
-from docling.document_converter import DocumentConverter
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PipelineOptions
+try:
+    from docling.document_converter import DocumentConverter
+    from docling.datamodel.base_models import DocumentStream, InputFormat
+    from docling.datamodel.pipeline_options import PipelineOptions
+    DOCLING_AVAILABLE = True
+except ImportError:
+    # Docling is optional; ParserFactory falls back to the traditional parsers without it
+    DocumentConverter = DocumentStream = InputFormat = PipelineOptions = None
+    DOCLING_AVAILABLE = False
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
@@ -14,6 +21,39 @@ from pydantic import BaseModel, Field
 from ..models.state import CVSection
 
 
+# Plain-text section headers, compiled once; checked in order so earlier sections win a line
+SECTION_PATTERNS = tuple((name, re.compile(pattern, re.IGNORECASE)) for name, pattern in (
+    ('contact', r'contact|personal\s+info|personal\s+details'),
+    ('summary', r'summary|profile|objective|about'),
+    ('experience', r'experience|employment|work\s+history|professional\s+experience'),
+    ('education', r'education|academic|qualifications'),
+    ('skills', r'skills|technical\s+skills|competencies'),
+    ('projects', r'projects|portfolio'),
+    ('certifications', r'certifications|certificates|licenses'),
+    ('achievements', r'achievements|accomplishments|awards'),
+    ('languages', r'languages|linguistic'),
+    ('references', r'references|referees')
+))
+
+# Markdown section headers as one anchored alternation; the named group that matched is the
+# section, and alternatives are tried in this order just like the plain-text patterns
+MARKDOWN_SECTION_PATTERN = re.compile(
+    r'^#+\s*(?:'
+    r'(?P<contact>contact|personal\s+info|personal\s+details)'
+    r'|(?P<summary>summary|profile|objective|about|professional\s+summary)'
+    r'|(?P<experience>experience|employment|work\s+history|professional\s+experience)'
+    r'|(?P<education>education|academic|qualifications|academic\s+background)'
+    r'|(?P<skills>skills|technical\s+skills|competencies|core\s+competencies)'
+    r'|(?P<projects>projects|portfolio|key\s+projects)'
+    r'|(?P<certifications>certifications|certificates|licenses)'
+    r'|(?P<achievements>achievements|accomplishments|awards)'
+    r'|(?P<languages>languages|linguistic|language\s+skills)'
+    r'|(?P<references>references|referees)'
+    r')',
+    re.IGNORECASE
+)
+
+
 class ParsedSection(BaseModel):
     """Pydantic model for LLM-parsed CV sections."""
     name: str = Field(..., description="Section name (e.g., 'summary', 'experience', 'skills')")
@@ -36,24 +76,20 @@ class DocumentParser:
         """Parse document and return raw text."""
         raise NotImplementedError
     
+    def parse_bytes(self, data: bytes, name: str = "") -> str:
+        """
+        Parse an in-memory document and return raw text.
+        
+        Args:
+            data: Document bytes
+            name: Original file name, for parsers that detect the format from its suffix
+        """
+        raise NotImplementedError
+    
     def extract_sections(self, text: str) -> Dict[str, CVSection]:
         """Extract structured sections from text using traditional regex patterns."""
         sections = {}
         
-        # Common CV section patterns
-        section_patterns = {
-            'contact': r'(?i)(contact|personal\s+info|personal\s+details)',
-            'summary': r'(?i)(summary|profile|objective|about)',
-            'experience': r'(?i)(experience|employment|work\s+history|professional\s+experience)',
-            'education': r'(?i)(education|academic|qualifications)',
-            'skills': r'(?i)(skills|technical\s+skills|competencies)',
-            'projects': r'(?i)(projects|portfolio)',
-            'certifications': r'(?i)(certifications|certificates|licenses)',
-            'achievements': r'(?i)(achievements|accomplishments|awards)',
-            'languages': r'(?i)(languages|linguistic)',
-            'references': r'(?i)(references|referees)'
-        }
-        
         lines = text.split('\n')
         current_section = 'other'
         current_content = []
@@ -65,11 +101,7 @@ class DocumentParser:
                 continue
                 
             # Check if line matches any section header
-            section_found = None
-            for section_name, pattern in section_patterns.items():
-                if re.search(pattern, line):
-                    section_found = section_name
-                    break
+            section_found = next((name for name, pattern in SECTION_PATTERNS if pattern.search(line)), None)
             
             if section_found:
                 # Save previous section
@@ -178,13 +210,24 @@ class PDFParser(DocumentParser):
         """Extract text from PDF file."""
         try:
             with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+                return self._read_pdf(file)
         except Exception as e:
             raise ValueError(f"Error parsing PDF: {str(e)}")
+    
+    def parse_bytes(self, data: bytes, name: str = "") -> str:
+        """Extract text from in-memory PDF content."""
+        try:
+            return self._read_pdf(BytesIO(data))
+        except Exception as e:
+            raise ValueError(f"Error parsing PDF: {str(e)}")
+    
+    def _read_pdf(self, file) -> str:
+        """Extract text from a binary PDF file object."""
+        pdf_reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text() + "\n"
+        return text.strip()
 
 
 class DocxParser(DocumentParser):
@@ -193,13 +236,24 @@ class DocxParser(DocumentParser):
     def parse(self, file_path: str) -> str:
         """Extract text from DOCX file."""
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return self._read_docx(file_path)
         except Exception as e:
             raise ValueError(f"Error parsing DOCX: {str(e)}")
+    
+    def parse_bytes(self, data: bytes, name: str = "") -> str:
+        """Extract text from in-memory DOCX content."""
+        try:
+            return self._read_docx(BytesIO(data))
+        except Exception as e:
+            raise ValueError(f"Error parsing DOCX: {str(e)}")
+    
+    def _read_docx(self, source) -> str:
+        """Extract text from a DOCX path or binary file object."""
+        doc = Document(source)
+        text = ""
+        for paragraph in doc.paragraphs:
+            text += paragraph.text + "\n"
+        return text.strip()
 
 
 class TextParser(DocumentParser):
@@ -212,6 +266,13 @@ class TextParser(DocumentParser):
                 return file.read().strip()
         except Exception as e:
             raise ValueError(f"Error parsing text file: {str(e)}")
+    
+    def parse_bytes(self, data: bytes, name: str = "") -> str:
+        """Decode in-memory plain text content."""
+        try:
+            return data.decode('utf-8').strip()
+        except Exception as e:
+            raise ValueError(f"Error parsing text file: {str(e)}")
 
 
 class LLMDocumentParser(DocumentParser):
@@ -239,6 +300,9 @@ class DoclingParser(DocumentParser):
     
     def __init__(self, use_llm: bool = True):
         """Initialize Docling converter with optional LLM section parsing."""
+        if DocumentConverter is None:
+            raise ImportError("Docling is not installed")
+        
         # Initialize with default configuration - Docling has good defaults for CV parsing
         self.converter = DocumentConverter()
         self.use_llm = use_llm
@@ -256,6 +320,16 @@ class DoclingParser(DocumentParser):
         except Exception as e:
             raise ValueError(f"Error parsing document with Docling: {str(e)}")
     
+    def parse_bytes(self, data: bytes, name: str = "") -> str:
+        """Extract text from in-memory document content using Docling."""
+        try:
+            # Docling detects the input format from the stream's file name
+            stream = DocumentStream(name=name or "upload.pdf", stream=BytesIO(data))
+            result = self.converter.convert(stream)
+            return result.document.export_to_markdown()
+        except Exception as e:
+            raise ValueError(f"Error parsing document with Docling: {str(e)}")
+    
     def extract_sections(self, text: str) -> Dict[str, CVSection]:
         """
         Enhanced section extraction using Docling's structured output.
@@ -271,20 +345,6 @@ class DoclingParser(DocumentParser):
         # Traditional markdown-based parsing as fallback
         sections = {}
         
-        # Enhanced CV section patterns that work with markdown
-        section_patterns = {
-            'contact': r'(?i)^#+\s*(contact|personal\s+info|personal\s+details)',
-            'summary': r'(?i)^#+\s*(summary|profile|objective|about|professional\s+summary)',
-            'experience': r'(?i)^#+\s*(experience|employment|work\s+history|professional\s+experience)',
-            'education': r'(?i)^#+\s*(education|academic|qualifications|academic\s+background)',
-            'skills': r'(?i)^#+\s*(skills|technical\s+skills|competencies|core\s+competencies)',
-            'projects': r'(?i)^#+\s*(projects|portfolio|key\s+projects)',
-            'certifications': r'(?i)^#+\s*(certifications|certificates|licenses)',
-            'achievements': r'(?i)^#+\s*(achievements|accomplishments|awards)',
-            'languages': r'(?i)^#+\s*(languages|linguistic|language\s+skills)',
-            'references': r'(?i)^#+\s*(references|referees)'
-        }
-        
         lines = text.split('\n')
         current_section = 'other'
         current_content = []
@@ -297,11 +357,8 @@ class DoclingParser(DocumentParser):
                 continue
                 
             # Check if line is a markdown header that matches section pattern
-            section_found = None
-            for section_name, pattern in section_patterns.items():
-                if re.match(pattern, line):
-                    section_found = section_name
-                    break
+            header = MARKDOWN_SECTION_PATTERN.match(line)
+            section_found = header.lastgroup if header else None
             
             if section_found:
                 # Save previous section with content
@@ -351,13 +408,14 @@ class ParserFactory:
         
         Args:
             file_path: Path to the document
-            use_docling: Whether to use Docling parser for supported formats
+            use_docling: Whether to use Docling parser for supported formats; ignored when
+                Docling is not installed
             use_llm: Whether to use LLM for section extraction
         """
         suffix = Path(file_path).suffix.lower()
         
         # Use Docling for supported formats when available
-        if use_docling and suffix in ['.pdf', '.docx', '.doc']:
+        if use_docling and DOCLING_AVAILABLE and suffix in ['.pdf', '.docx', '.doc']:
             return DoclingParser(use_llm=use_llm)
         
         # Fallback to traditional parsers
@@ -1,9 +1,60 @@
+import re
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Any
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..models.state import CVState
 
+# Upper bound on the prompt context sent to the LLM for suggestion generation
+MAX_CONTEXT_CHARS = 4000
+MAX_RESPONSE_CHARS = 200
+
+# Weak and strength indicators in experience descriptions, matched as case-insensitive
+# substrings; each distinct phrase found counts once
+_WEAK_PHRASES_RE = re.compile(
+    r'worked on|responsible for|involved in|participated in|helped with|assisted with|'
+    r'various projects|daily tasks|collaborated with team|used programming languages',
+    re.IGNORECASE
+)
+_STRONG_PHRASES_RE = re.compile(
+    r'led|developed|implemented|designed|created|built|'
+    r'optimized|improved|achieved|delivered|launched',
+    re.IGNORECASE
+)
+
+# Numbers, percentages, dollar amounts and other quantified achievements
+_METRICS_PATTERNS = [
+    r'\d+%',  # Percentages
+    r'\$\d+',  # Dollar amounts
+    r'\d+\+',  # Numbers with plus
+    r'increased.*\d+',  # Increased by number
+    r'reduced.*\d+',   # Reduced by number
+    r'managed.*\d+',   # Managed X people/projects
+    r'\d+\s*(years?|months?)',  # Time periods
+    r'\d+\s*(people|team|members)',  # Team sizes
+]
+
+
+# Verdicts are cached by content so repeated checks on the same CV are free
+@lru_cache(maxsize=128)
+def _content_lacks_metrics(content: str) -> bool:
+    """Check if the given CV content lacks quantifiable achievements."""
+    for pattern in _METRICS_PATTERNS:
+        if re.search(pattern, content, re.IGNORECASE):
+            return False
+    
+    return True
+
+
+@lru_cache(maxsize=128)
+def _is_weak_experience_content(experience_content: str) -> bool:
+    """Check if the given experience content is weak or generic."""
+    weak_count = len({phrase.lower() for phrase in _WEAK_PHRASES_RE.findall(experience_content)})
+    strong_count = len({phrase.lower() for phrase in _STRONG_PHRASES_RE.findall(experience_content)})
+    
+    # If more weak phrases than strong ones, or very short content
+    return weak_count > strong_count or len(experience_content) < 200
+
 
 class UserInteractionManager:
     """Manages user interactions for gathering additional information and providing suggestions."""
@@ -11,6 +62,14 @@ class UserInteractionManager:
     def __init__(self, model_name: str = "gpt-4.1-mini"):
         """Initialize with specified LLM model."""
         self.model_name = model_name
+        self._llm = None
+    
+    def _get_llm(self):
+        """Lazily create the chat model so LangChain is only imported on first LLM use."""
+        if self._llm is None:
+            from langchain.chat_models import init_chat_model
+            self._llm = init_chat_model(self.model_name, temperature=0.3)
+        return self._llm
     
     def ask_for_more_information(self, state: CVState) -> Dict[str, str]:
         """
@@ -78,12 +137,8 @@ class UserInteractionManager:
             questions["application_context"] = "Are you applying to specific companies or types of roles? This helps me tailor keyword and formatting suggestions."
         
         # Limit to 3-4 questions max to avoid overwhelming the user
-        prioritized_questions = {}
-        question_keys = list(questions.keys())
-        for key in question_keys[:4]:  # Take first 4 prioritized questions
-            prioritized_questions[key] = questions[key]
-        
-        return prioritized_questions
+        # Dicts preserve insertion order, so the first 4 entries are the highest-priority ones
+        return dict(islice(questions.items(), 4))
     
     def generate_specific_suggestions(self, state: CVState, user_responses: Dict[str, str] = None) -> List[Dict[str, Any]]:
         """
@@ -97,7 +152,8 @@ class UserInteractionManager:
             List of specific suggestions with priorities and actions
         """
         try:
-            llm = init_chat_model(self.model_name, temperature=0.3)
+            from langchain_core.messages import HumanMessage, SystemMessage
+            llm = self._get_llm()
             
             # Prepare context for LLM
             context = self._prepare_context(state, user_responses)
@@ -190,54 +246,46 @@ class UserInteractionManager:
             if isinstance(section_data, dict):
                 content += section_data.get("content", "")
         
-        # Look for numbers, percentages, dollar amounts
-        import re
-        metrics_patterns = [
-            r'\d+%',  # Percentages
-            r'\$\d+',  # Dollar amounts
-            r'\d+\+',  # Numbers with plus
-            r'increased.*\d+',  # Increased by number
-            r'reduced.*\d+',   # Reduced by number
-            r'managed.*\d+',   # Managed X people/projects
-            r'\d+\s*(years?|months?)',  # Time periods
-            r'\d+\s*(people|team|members)',  # Team sizes
-        ]
-        
-        for pattern in metrics_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return False
-        
-        return True
+        return _content_lacks_metrics(content)
     
     def _has_weak_experience_descriptions(self, parsed_sections: Dict) -> bool:
         """Check if experience descriptions are weak or generic."""
         experience_section = parsed_sections.get("experience", {})
         if not experience_section:
             return True
-            
-        experience_content = experience_section.get("content", "").lower()
-        
-        # Check for weak indicators
-        weak_phrases = [
-            "worked on", "responsible for", "involved in", "participated in",
-            "helped with", "assisted with", "various projects", "daily tasks",
-            "collaborated with team", "used programming languages"
-        ]
-        
-        # Check for strength indicators
-        strong_phrases = [
-            "led", "developed", "implemented", "designed", "created", "built",
-            "optimized", "improved", "achieved", "delivered", "launched"
-        ]
-        
-        weak_count = sum(1 for phrase in weak_phrases if phrase in experience_content)
-        strong_count = sum(1 for phrase in strong_phrases if phrase in experience_content)
-        
-        # If more weak phrases than strong ones, or very short content
-        return weak_count > strong_count or len(experience_content) < 200
+        
+        return _is_weak_experience_content(experience_section.get("content", ""))
     
     def _prepare_context(self, state: CVState, user_responses: Dict[str, str] = None) -> str:
-        """Prepare context string for LLM analysis."""
+        """Prepare context string for LLM analysis, capped at MAX_CONTEXT_CHARS."""
+        parsed_sections = state.get("parsed_sections", {})
+        section_names = list(parsed_sections)
+        gaps = state.get("identified_gaps", [])[:3]
+        responses = dict(user_responses) if user_responses else {}
+        
+        context = self._render_context(state, section_names, gaps, responses)
+        
+        # Trim lowest-priority fields first: user responses, then gaps, then the section list
+        if len(context) > MAX_CONTEXT_CHARS:
+            responses = {
+                key: value[:MAX_RESPONSE_CHARS] + "..." if len(value) > MAX_RESPONSE_CHARS else value
+                for key, value in responses.items()
+            }
+            context = self._render_context(state, section_names, gaps, responses)
+        
+        if len(context) > MAX_CONTEXT_CHARS:
+            gaps = gaps[:2]
+            context = self._render_context(state, section_names, gaps, responses)
+        
+        if len(context) > MAX_CONTEXT_CHARS:
+            section_names = section_names[:10]
+            context = self._render_context(state, section_names, gaps, responses)
+        
+        return context[:MAX_CONTEXT_CHARS]
+    
+    def _render_context(self, state: CVState, section_names: List[str], gaps: List[str],
+                        user_responses: Dict[str, str]) -> str:
+        """Render the context fields into a single prompt string."""
         context_parts = []
         
         # Basic info
@@ -246,7 +294,7 @@ class UserInteractionManager:
         
         # CV sections summary
         parsed_sections = state.get("parsed_sections", {})
-        context_parts.append(f"CV has {len(parsed_sections)} sections: {list(parsed_sections.keys())}")
+        context_parts.append(f"CV has {len(parsed_sections)} sections: {section_names}")
         
         # Analysis scores if available
         analysis_scores = state.get("analysis_scores")
@@ -254,9 +302,8 @@ class UserInteractionManager:
             context_parts.append(f"Overall CV Score: {analysis_scores.get('overall_score', 'Unknown')}")
         
         # Identified gaps
-        gaps = state.get("identified_gaps", [])
         if gaps:
-            context_parts.append(f"Identified Gaps: {', '.join(gaps[:3])}")
+            context_parts.append(f"Identified Gaps: {', '.join(gaps)}")
         
         # User responses
         if user_responses:
@@ -1,45 +1,225 @@
 import os
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import threading
 from typing import Dict, Any, Optional
 import time
-from langsmith import Client
-from langsmith.run_helpers import traceable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# langsmith is only needed when tracing is configured; fall back to a no-op decorator without it
+try:
+    from langsmith.run_helpers import traceable
+except ImportError:
+    def traceable(*args, **kwargs):
+        return lambda func: func
+
+# Identical warnings within this window are logged once, so LangSmith outages can't flood the output
+LOG_RATE_LIMIT_SECONDS = 60.0
+
+
+class _RateLimitFilter(logging.Filter):
+    """Drop log records whose message was already emitted within the rate-limit window."""
+    
+    def __init__(self, window_seconds: float = LOG_RATE_LIMIT_SECONDS):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self._last_emitted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emitted.get(message)
+            if last is not None and now - last < self.window_seconds:
+                return False
+            self._last_emitted[message] = now
+            # Forget expired messages so distinct errors can't grow the map without bound
+            if len(self._last_emitted) > 256:
+                self._last_emitted = {
+                    msg: ts for msg, ts in self._last_emitted.items()
+                    if now - ts < self.window_seconds
+                }
+        return True
+
+
+_log = logging.getLogger("cv_agent.monitoring")
+_log.addFilter(_RateLimitFilter())
+
+# Feedback delivery settings for the background sender
+FEEDBACK_MAX_RETRIES = 3
+FEEDBACK_RETRY_BACKOFF_SECONDS = 0.5
+FEEDBACK_FLUSH_TIMEOUT_SECONDS = 5.0
+# Feedback waiting for the sender is capped; overflow is written to the trace buffer instead
+FEEDBACK_QUEUE_MAX_SIZE = 1000
+
+# Events that still fail after retries are buffered on disk and retried periodically
+TRACE_BUFFER_FILE = ".langsmith/appendonly.jsonl"
+TRACE_BUFFER_RETRY_SECONDS = 30.0
+CLIENT_TIMEOUT_MS = (5000, 60000)  # (connect, read)
+
+# Dashboard refreshes within this window reuse the last metrics instead of querying LangSmith
+METRICS_CACHE_TTL_SECONDS = 60.0
+
+# State keys holding full CV text or uploaded file bytes, which are summarized before traces are uploaded
+MASKED_TEXT_KEYS = ("raw_text", "enhanced_cv", "original_cv", "original_cv_text", "raw_bytes")
+TRACE_PREVIEW_CHARS = 256
+
+
+def _summarize_text(text: str) -> Dict[str, Any]:
+    """Summarize a CV text as its length, a short hash and a preview."""
+    return {
+        "length": len(text),
+        "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest()[:12],
+        "preview": text[:TRACE_PREVIEW_CHARS]
+    }
+
+
+def _summarize_bytes(data: bytes) -> Dict[str, Any]:
+    """Summarize uploaded file bytes as their length and a short hash; binary content gets no preview."""
+    return {
+        "length": len(data),
+        "sha256": hashlib.sha256(data).hexdigest()[:12]
+    }
+
+
+def _mask_cv(payload: Any) -> Any:
+    """Replace full CV text in a trace payload with a compact summary."""
+    if isinstance(payload, dict):
+        return {
+            key: _summarize_text(value) if key in MASKED_TEXT_KEYS and isinstance(value, str)
+            else _summarize_bytes(value) if key in MASKED_TEXT_KEYS and isinstance(value, bytes)
+            else _mask_cv(value)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, (list, tuple)):
+        return [_mask_cv(item) for item in payload]
+    return payload
+
+
+class TraceBuffer:
+    """Append-only JSONL buffer for LangSmith events that could not be delivered."""
+    
+    def __init__(self, path: str = TRACE_BUFFER_FILE):
+        self.path = Path(path)
+        # _lock guards the file; _retry_lock serializes replays, which send without holding _lock
+        self._lock = threading.Lock()
+        self._retry_lock = threading.Lock()
+    
+    def append(self, event: Dict[str, Any]):
+        """Persist an undelivered event."""
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(event, default=str) + "\n")
+            except OSError as e:
+                _log.warning("Failed to buffer LangSmith event: %s", e)
+    
+    def retry(self, send) -> int:
+        """
+        Re-send buffered events. Replay stops at the first connection error and keeps
+        the remaining events; events rejected for any other reason are dropped so one
+        invalid event cannot block the rest. Events are sent without holding the file
+        lock, so append never waits on LangSmith.
+        
+        Args:
+            send: Callable taking one event; it should raise to signal failure
+            
+        Returns:
+            Number of events delivered
+        """
+        from langsmith.utils import LangSmithConnectionError
+        
+        with self._retry_lock:
+            with self._lock:
+                if not self.path.exists():
+                    return 0
+                lines = self.path.read_text(encoding="utf-8").splitlines()
+            
+            delivered = 0
+            processed = len(lines)
+            for index, line in enumerate(lines):
+                try:
+                    send(json.loads(line))
+                    delivered += 1
+                except LangSmithConnectionError:
+                    # The connection is most likely still down; keep this and later events
+                    processed = index
+                    break
+                except Exception as e:
+                    _log.warning("Dropping undeliverable LangSmith event: %s", e)
+            
+            with self._lock:
+                # Keep undelivered events followed by any appended while sending
+                current = self.path.read_text(encoding="utf-8").splitlines() if self.path.exists() else []
+                remaining = lines[processed:] + current[len(lines):]
+                if remaining:
+                    self.path.write_text("\n".join(remaining) + "\n", encoding="utf-8")
+                else:
+                    self.path.unlink(missing_ok=True)
+            return delivered
 
 
 class LangSmithMonitor:
     """LangSmith integration for monitoring and optimization."""
     
-    def __init__(self, project_name: str = "cv-improvement-agent"):
+    def __init__(self, project_name: str = "cv-improvement-agent",
+                 buffer_path: str = TRACE_BUFFER_FILE):
         self.client = None
         self.project_name = project_name
+        self._trace_buffer = TraceBuffer(buffer_path)
+        self._metrics_cache: Dict[tuple, tuple] = {}
         
-        # Initialize LangSmith client if API key is available
+        # Initialize LangSmith client if API key is available; the import is deferred until then
         if os.getenv("LANGSMITH_API_KEY"):
             try:
-                self.client = Client()
+                from langsmith import Client
+                self.client = Client(auto_batch_tracing=True, timeout_ms=CLIENT_TIMEOUT_MS)
                 self.enabled = True
             except Exception:
                 self.enabled = False
         else:
             self.enabled = False
+        
+        # Feedback is sent from a background thread so the UI never blocks on LangSmith
+        self._feedback_queue: queue.Queue = queue.Queue(maxsize=FEEDBACK_QUEUE_MAX_SIZE)
+        if self.enabled:
+            threading.Thread(
+                target=self._process_feedback_queue,
+                name="langsmith-feedback",
+                daemon=True
+            ).start()
+            atexit.register(self.flush_feedback)
     
     @traceable(name="cv_processing_workflow")
-    def trace_cv_processing(self, state: Dict[str, Any], node_name: str, 
-                           result: Dict[str, Any]) -> Dict[str, Any]:
-        """Trace CV processing workflow steps."""
+    def trace_cv_processing(self, node_name: str, processing_time: Optional[float] = None,
+                           target_role: Optional[str] = None,
+                           target_industry: Optional[str] = None,
+                           file_format: Optional[str] = None, error_count: int = 0,
+                           result_summary: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Trace CV processing workflow steps.
+        
+        Only scalar metadata is passed in, so the traced payload stays small
+        regardless of CV size. Use summarize_result to build result_summary.
+        """
         if not self.enabled:
-            return result
+            return None
         
-        # Add tracing metadata
-        metadata = {
-            "node_name": node_name,
-            "processing_time": result.get("processing_time"),
-            "target_role": state.get("target_role"),
-            "target_industry": state.get("target_industry"),
-            "file_format": state.get("file_format"),
+        return result_summary
+    
+    @staticmethod
+    def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the small result summary passed to trace_cv_processing."""
+        return {
+            "keys": list(result),
             "errors": len(result.get("processing_errors", []))
         }
-        
-        return result
     
     @traceable(name="cv_analysis_scoring")
     def trace_analysis_scoring(self, analysis_scores: Dict[str, Any]) -> Dict[str, Any]:
@@ -54,77 +234,173 @@ class LangSmithMonitor:
     def trace_improvement_generation(self, improvements: list, 
                                    target_role: Optional[str] = None) -> list:
         """Trace improvement generation process."""
-        if not self.enabled:
-            return improvements
-        
-        # Log improvement generation metrics
-        improvement_types = {}
-        for imp in improvements:
-            imp_type = imp.get("type", "unknown")
-            improvement_types[imp_type] = improvement_types.get(imp_type, 0) + 1
-        
+        # The traceable decorator records the improvements; nothing else to compute
         return improvements
     
     def log_user_feedback(self, run_id: str, feedback: Dict[str, Any]):
-        """Log user feedback for continuous improvement."""
+        """Queue user feedback for continuous improvement; sent in the background."""
         if not self.enabled or not self.client:
             return
         
         try:
-            self.client.create_feedback(
-                run_id=run_id,
-                key="user_satisfaction",
-                score=feedback.get("satisfaction_score", 0),
-                comment=feedback.get("comment", "")
-            )
-        except Exception as e:
-            print(f"Failed to log feedback: {e}")
+            self._feedback_queue.put_nowait((run_id, feedback))
+        except queue.Full:
+            # The sender is falling behind; the worker retries buffered events when it is idle
+            self._trace_buffer.append({"run_id": str(run_id), "feedback": feedback})
+    
+    def flush_feedback(self, timeout: float = FEEDBACK_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """
+        Wait for queued feedback to be sent.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            True if the queue was drained, False if the timeout expired first
+        """
+        deadline = time.monotonic() + timeout
+        with self._feedback_queue.all_tasks_done:
+            while self._feedback_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._feedback_queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _process_feedback_queue(self):
+        """Background worker that sends queued feedback and periodically retries the buffer."""
+        while True:
+            try:
+                run_id, feedback = self._feedback_queue.get(timeout=TRACE_BUFFER_RETRY_SECONDS)
+            except queue.Empty:
+                self._trace_buffer.retry(
+                    lambda event: self._create_feedback(event["run_id"], event["feedback"])
+                )
+                continue
+            try:
+                self._send_feedback(run_id, feedback)
+            finally:
+                self._feedback_queue.task_done()
+    
+    def _send_feedback(self, run_id: str, feedback: Dict[str, Any]):
+        """Send a single feedback entry, retrying transient connection errors with backoff."""
+        from langsmith.utils import LangSmithConnectionError
+        
+        for attempt in range(FEEDBACK_MAX_RETRIES):
+            try:
+                self._create_feedback(run_id, feedback)
+                return
+            except LangSmithConnectionError as e:
+                if attempt == FEEDBACK_MAX_RETRIES - 1:
+                    _log.warning("Failed to log feedback, buffering for retry: %s", e)
+                    self._trace_buffer.append({"run_id": str(run_id), "feedback": feedback})
+                    return
+                time.sleep(FEEDBACK_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            except Exception as e:
+                _log.warning("Failed to log feedback: %s", e)
+                return
+    
+    def _create_feedback(self, run_id: str, feedback: Dict[str, Any]):
+        """Send one feedback entry to LangSmith."""
+        self.client.create_feedback(
+            run_id=run_id,
+            key="user_satisfaction",
+            score=feedback.get("satisfaction_score", 0),
+            comment=feedback.get("comment", "")
+        )
     
-    def get_performance_metrics(self, days: int = 7) -> Dict[str, Any]:
-        """Retrieve performance metrics from LangSmith."""
+    def get_performance_metrics(self, days: int = 7, limit: int = 100) -> Dict[str, Any]:
+        """
+        Retrieve performance metrics from LangSmith.
+        
+        Only root workflow runs are listed, with just the fields needed for the
+        metrics, and statistics are accumulated in a single pass. Results are
+        cached for METRICS_CACHE_TTL_SECONDS so dashboard refreshes stay local.
+        
+        Args:
+            days: Only include runs started within the last N days
+            limit: Maximum number of runs to fetch
+        """
         if not self.enabled or not self.client:
             return {}
         
+        cache_key = (days, limit)
+        cached = self._metrics_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < METRICS_CACHE_TTL_SECONDS:
+            return dict(cached[1])
+        
+        metrics = self._fetch_performance_metrics(days, limit)
+        if metrics:
+            self._metrics_cache[cache_key] = (time.monotonic(), metrics)
+        return dict(metrics)
+    
+    def _fetch_performance_metrics(self, days: int, limit: int) -> Dict[str, Any]:
+        """Query LangSmith and compute performance metrics."""
         try:
-            # Get runs from the last N days
-            runs = list(self.client.list_runs(
+            # Get root runs from the last N days; child node runs would skew the averages
+            runs = self.client.list_runs(
                 project_name=self.project_name,
-                limit=100
-            ))
+                start_time=datetime.now(timezone.utc) - timedelta(days=days),
+                is_root=True,
+                select=["id", "error", "start_time", "end_time"],
+                limit=limit
+            )
             
             # Calculate metrics
-            total_runs = len(runs)
-            successful_runs = sum(1 for run in runs if not run.error)
-            avg_processing_time = sum(
-                (run.end_time - run.start_time).total_seconds() 
-                for run in runs if run.end_time and run.start_time
-            ) / total_runs if total_runs > 0 else 0
+            total_runs = 0
+            successful_runs = 0
+            total_processing_time = 0.0
+            for run in runs:
+                total_runs += 1
+                if not run.error:
+                    successful_runs += 1
+                if run.end_time and run.start_time:
+                    total_processing_time += (run.end_time - run.start_time).total_seconds()
+            
+            if total_runs == 0:
+                return {
+                    "total_runs": 0,
+                    "success_rate": 0,
+                    "avg_processing_time_seconds": 0,
+                    "error_rate": 0
+                }
             
             return {
                 "total_runs": total_runs,
-                "success_rate": successful_runs / total_runs if total_runs > 0 else 0,
-                "avg_processing_time_seconds": avg_processing_time,
-                "error_rate": (total_runs - successful_runs) / total_runs if total_runs > 0 else 0
+                "success_rate": successful_runs / total_runs,
+                "avg_processing_time_seconds": total_processing_time / total_runs,
+                "error_rate": (total_runs - successful_runs) / total_runs
             }
             
         except Exception as e:
-            print(f"Failed to retrieve metrics: {e}")
+            _log.warning("Failed to retrieve metrics: %s", e)
             return {}
 
 
 # Decorators for easy tracing
+def tracing_enabled() -> bool:
+    """Return True when LangSmith tracing is switched on and an API key is configured."""
+    return (
+        os.getenv("LANGSMITH_TRACING", "").lower() == "true"
+        and bool(os.getenv("LANGSMITH_API_KEY"))
+    )
+
+
 def trace_cv_node(node_name: str):
-    """Decorator for tracing CV processing nodes."""
+    """Decorator for tracing CV processing nodes; leaves the node unwrapped when tracing is off."""
     def decorator(func):
-        @traceable(name=f"cv_node_{node_name}")
+        if not tracing_enabled():
+            return func
+        
+        @traceable(name=f"cv_node_{node_name}", process_inputs=_mask_cv, process_outputs=_mask_cv)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = func(*args, **kwargs)
-            end_time = time.time()
+            elapsed_seconds = (time.perf_counter_ns() - start_ns) / 1e9
             
-            # Add timing information
-            if isinstance(result, dict):
-                result["node_processing_time"] = end_time - start_time
+            # Add timing information without clobbering a timing set by the node itself
+            if isinstance(result, dict) and "node_processing_time" not in result:
+                result["node_processing_time"] = elapsed_seconds
             
             return result
         return wrapper
@@ -1,4 +1,12 @@
-from typing import Dict, Any
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from pydantic import BaseModel
 from langgraph.graph import StateGraph, END
 
 from .models.state import CVState
@@ -6,28 +14,59 @@ from .nodes.parsing import parse_cv_node
 from .nodes.analysis import analyze_quality_node, match_requirements_node  
 from .nodes.improvement import generate_improvements_node, apply_improvements_node
 
+MODEL_NAME = "gpt-4.1-mini"
+
+# Result cache policies accepted by CVImprovementAgent:
+#   enabled    - read from and write to the cache
+#   read_only  - serve cache hits but never store new results
+#   write_only - always run the workflow and store the result
+#   replay     - serve cache hits only; a miss raises KeyError
+#   disabled   - bypass the cache entirely
+CACHE_POLICIES = ("enabled", "read_only", "write_only", "replay", "disabled")
+
+# Cached results older than this are treated as misses, bounding how long stale analyses are served
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Part of every cache key; bump when the result layout changes so persisted results are not reused
+CACHE_VERSION = 1
+
+# Modules holding the LLM prompts used by the workflow; their source hash is part of every
+# cache key, so editing a prompt invalidates cached results without waiting for the TTL
+PROMPT_SOURCES = ("nodes/improvement.py", "tools/parsers.py")
+PROMPT_VERSION = hashlib.sha256(
+    b"".join((Path(__file__).parent / source).read_bytes() for source in PROMPT_SOURCES)
+).hexdigest()[:12]
+
+# Processed results kept in memory; the agent is shared process-wide, so this bounds it across all users
+RESULT_CACHE_MAX_ENTRIES = 128
+
+# Parsed CVs kept in memory so re-running one CV for another role or industry skips parsing
+PARSE_CACHE_MAX_ENTRIES = 64
+
+# Workflow state fields produced by parse_cv_node and reused from the parse cache
+PARSED_FIELDS = ("raw_text", "file_format", "parsed_sections")
+
+
+def normalize_improvements(improvements: List[Any]) -> List[Dict[str, Any]]:
+    """Convert improvements to plain dicts so consumers can index fields directly."""
+    return [imp.model_dump() if isinstance(imp, BaseModel) else imp for imp in improvements]
+
 
 def should_apply_improvements(state: CVState) -> str:
     """Conditional edge to determine if improvements should be applied."""
     improvements = state.get("suggested_improvements", [])
-    high_priority_improvements = []
-    
-    for imp in improvements:
-        # Handle both Pydantic objects and dictionary formats
-        if hasattr(imp, 'priority'):  # Pydantic object
-            priority = imp.priority
-            confidence = imp.confidence
-        else:  # Dictionary
-            priority = imp.get("priority")
-            confidence = imp.get("confidence", 0)
-        
-        if priority == "high" and confidence > 0.7:
-            high_priority_improvements.append(imp)
-    
-    if high_priority_improvements:
-        return "apply_improvements"
-    else:
+    if not improvements:
         return "quality_check"
+    
+    # Handle both Pydantic objects and dictionary formats, item by item since lists may mix them
+    has_high_priority = any(
+        imp.get("priority") == "high" and imp.get("confidence", 0) > 0.7
+        if isinstance(imp, dict)
+        else imp.priority == "high" and imp.confidence > 0.7
+        for imp in improvements
+    )
+    
+    return "apply_improvements" if has_high_priority else "quality_check"
 
 
 def quality_check_node(state: CVState) -> Dict[str, Any]:
@@ -42,8 +81,8 @@ def quality_check_node(state: CVState) -> Dict[str, Any]:
     else:
         quality_score = 0.70  # Base score without improvements
     
+    # Return only the new keys; LangGraph merges them into the workflow state
     return {
-        **state,
         "final_quality_score": quality_score,
         "processing_complete": True
     }
@@ -71,8 +110,10 @@ def create_cv_improvement_workflow() -> StateGraph:
     # Add edges
     workflow.set_entry_point("parse_cv")
     workflow.add_edge("parse_cv", "analyze_quality")
-    workflow.add_edge("analyze_quality", "match_requirements")
-    workflow.add_edge("match_requirements", "generate_improvements")
+    
+    # Quality analysis and requirement matching are independent, so run them in parallel
+    workflow.add_edge("parse_cv", "match_requirements")
+    workflow.add_edge(["analyze_quality", "match_requirements"], "generate_improvements")
     
     # Conditional edge based on improvement quality
     workflow.add_conditional_edges(
@@ -91,29 +132,122 @@ def create_cv_improvement_workflow() -> StateGraph:
 
 
 class CVImprovementAgent:
-    """Main CV Improvement Agent class."""
+    """
+    Main CV Improvement Agent class.
+    
+    Instances are safe to share between threads; use get_default_agent() for the
+    process-wide instance instead of compiling a graph per caller.
+    """
     
-    def __init__(self):
+    def __init__(self, cache_policy: str = "enabled", cache_dir: Optional[str] = None,
+                 cache_ttl: float = CACHE_TTL_SECONDS):
+        """
+        Args:
+            cache_policy: One of CACHE_POLICIES, controls the process_cv result cache
+            cache_dir: Optional directory to persist cached results across processes
+            cache_ttl: Seconds a cached result stays valid
+        """
+        if cache_policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy: {cache_policy}")
+        
         self.workflow = create_cv_improvement_workflow()
         self.app = self.workflow.compile()
+        self.cache_policy = cache_policy
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl
+        # Maps cache key to (stored_at, result), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Maps parse key to the PARSED_FIELDS of a successful parse, least recently used first
+        self._parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._parse_lock = threading.Lock()
     
-    def process_cv(self, cv_input: str, target_role: str = None, 
-                  target_industry: str = None) -> Dict[str, Any]:
+    def process_cv(self, cv_input: Union[str, bytes], target_role: str = None, 
+                  target_industry: str = None, file_format: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a CV and return improvement recommendations.
         
+        Results are cached by a SHA256 key of the inputs and model according to
+        the agent's cache policy, so re-running an unchanged CV skips the workflow.
+        
         Args:
-            cv_input: File path to CV or raw text content
+            cv_input: File path to CV, raw text content, or uploaded file bytes
             target_role: Target job role for optimization
             target_industry: Target industry for keyword optimization
+            file_format: Format of bytes input ('pdf', 'docx', 'txt')
             
         Returns:
             Final state with analysis results and improvements
         """
+        cache_key = self._cache_key(cv_input, target_role, target_industry, file_format)
+        
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Run the workflow, reusing an earlier parse of the same CV when there is one
+        parse_key = self._parse_key(cv_input, file_format)
+        result = self.app.invoke(self._initial_state(cv_input, target_role, target_industry, file_format,
+                                                     parsed=self._parse_get(parse_key)))
+        self._parse_put(parse_key, result)
+        
+        return self._finalize_result(cache_key, result)
+    
+    def stream_cv(self, cv_input: Union[str, bytes], target_role: str = None,
+                  target_industry: str = None,
+                  file_format: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Process a CV, yielding progress after each workflow node completes.
+        
+        Args:
+            cv_input: File path to CV, raw text content, or uploaded file bytes
+            target_role: Target job role for optimization
+            target_industry: Target industry for keyword optimization
+            file_format: Format of bytes input ('pdf', 'docx', 'txt')
+            
+        Yields:
+            Tuples of (node_name, state_so_far). The state yielded last is the final
+            result, equivalent to the return value of process_cv
+        """
+        cache_key = self._cache_key(cv_input, target_role, target_industry, file_format)
+        
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            yield "cache", cached
+            return
+        
+        parse_key = self._parse_key(cv_input, file_format)
+        state = dict(self._initial_state(cv_input, target_role, target_industry, file_format,
+                                         parsed=self._parse_get(parse_key)))
         
-        initial_state = CVState(
-            original_cv=cv_input,
-            file_format="unknown",
+        # "updates" chunks name the nodes that ran in a step; the following "values"
+        # chunk is the state after LangGraph applied their updates with the reducers
+        completed_nodes = []
+        for mode, chunk in self.app.stream(state, stream_mode=["updates", "values"]):
+            if mode == "updates":
+                completed_nodes.extend(chunk)
+                continue
+            state = chunk
+            for node_name in completed_nodes:
+                yield node_name, state
+            completed_nodes = []
+        
+        self._parse_put(parse_key, state)
+        self._finalize_result(cache_key, state)
+    
+    def _initial_state(self, cv_input: Union[str, bytes], target_role: Optional[str],
+                       target_industry: Optional[str], file_format: Optional[str] = None,
+                       parsed: Optional[Dict[str, Any]] = None) -> CVState:
+        """
+        Build the initial workflow state for a CV. When parsed holds the PARSED_FIELDS
+        of an earlier parse, they are filled in and parse_cv_node skips parsing.
+        """
+        # Uploaded bytes are parsed in memory rather than round-tripped through a temp file
+        is_bytes = isinstance(cv_input, bytes)
+        state = CVState(
+            original_cv="" if is_bytes else cv_input,
+            raw_bytes=cv_input if is_bytes else None,
+            file_format=file_format or "unknown",
             target_role=target_role,
             target_industry=target_industry,
             parsed_sections={},
@@ -126,14 +260,153 @@ class CVImprovementAgent:
             enhancement_summary=None,
             processing_errors=[],
             processing_time=None,
-            model_used="gpt-4.1-mini"
+            model_used=MODEL_NAME
         )
+        if parsed:
+            state.update(parsed)
+        return state
+    
+    def _cache_lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result if the cache policy allows reads."""
+        if self.cache_policy not in ("enabled", "read_only", "replay"):
+            return None
         
-        # Run the workflow
-        result = self.app.invoke(initial_state)
+        cached = self._cache_get(cache_key)
+        if cached is None and self.cache_policy == "replay":
+            raise KeyError(f"No cached result for CV input in replay mode (key {cache_key[:12]})")
+        return cached
+    
+    def _finalize_result(self, cache_key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a completed workflow result and store it according to the cache policy."""
+        # The upload has been parsed into raw_text; don't keep a second copy of the file in results
+        if result.get("raw_bytes"):
+            result["raw_bytes"] = None
+        
+        # Normalize improvement records once so downstream consumers never branch on type
+        for key in ("suggested_improvements", "applied_improvements"):
+            if result.get(key):
+                result[key] = normalize_improvements(result[key])
+        
+        # Failed runs are not cached, so a transient outage isn't served again until the TTL expires
+        if self.cache_policy in ("enabled", "write_only") and not result.get("processing_errors"):
+            self._cache_put(cache_key, result)
         
         return result
     
+    def _cache_key(self, cv_input: Union[str, bytes], target_role: Optional[str],
+                   target_industry: Optional[str], file_format: Optional[str] = None) -> str:
+        """Build the SHA256 cache key for a process_cv call."""
+        hasher = hashlib.sha256()
+        
+        # Hash file contents rather than the path so re-uploads of the same CV hit the cache
+        if isinstance(cv_input, bytes):
+            hasher.update(cv_input)
+        elif os.path.isfile(cv_input):
+            hasher.update(Path(cv_input).read_bytes())
+        else:
+            hasher.update(cv_input.encode("utf-8"))
+        
+        hasher.update(f"|{file_format or ''}|{target_role or ''}|{target_industry or ''}|{MODEL_NAME}|v{CACHE_VERSION}|{PROMPT_VERSION}".encode("utf-8"))
+        return hasher.hexdigest()
+    
+    def _parse_key(self, cv_input: Union[str, bytes], file_format: Optional[str]) -> str:
+        """Build the parse cache key; it covers only the CV content and format, not the role or industry."""
+        return "parse:" + self._cache_key(cv_input, None, None, file_format)
+    
+    def _parse_get(self, parse_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached parse for a CV, if the cache policy allows reuse."""
+        if self.cache_policy == "disabled":
+            return None
+        with self._parse_lock:
+            parsed = self._parse_cache.get(parse_key)
+            if parsed is not None:
+                self._parse_cache.move_to_end(parse_key)
+            return parsed
+    
+    def _parse_put(self, parse_key: str, result: Dict[str, Any]):
+        """Remember the parsed fields of a workflow result, evicting the least recently used parse."""
+        if self.cache_policy == "disabled" or not result.get("raw_text") or not result.get("parsed_sections"):
+            return
+        with self._parse_lock:
+            self._parse_cache[parse_key] = {field: result.get(field) for field in PARSED_FIELDS}
+            self._parse_cache.move_to_end(parse_key)
+            while len(self._parse_cache) > PARSE_CACHE_MAX_ENTRIES:
+                self._parse_cache.popitem(last=False)
+    
+    def _cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up an unexpired cached result in memory, then on disk if persistence is enabled."""
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                self._cache.move_to_end(cache_key)
+        
+        if entry is None and self.cache_dir:
+            cache_file = self.cache_dir / f"{cache_key}.pkl"
+            if cache_file.exists():
+                try:
+                    stored_at = cache_file.stat().st_mtime
+                    if time.time() - stored_at >= self.cache_ttl:
+                        # Expired files still hold the CV, so delete rather than skip them
+                        cache_file.unlink(missing_ok=True)
+                    else:
+                        with open(cache_file, "rb") as f:
+                            entry = (stored_at, pickle.load(f))
+                        self._cache_store(cache_key, entry)
+                except Exception as e:
+                    print(f"Failed to load cached result: {e}")
+        
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.time() - stored_at >= self.cache_ttl:
+            with self._cache_lock:
+                self._cache.pop(cache_key, None)
+            return None
+        
+        # Hand out a copy so callers can annotate the result without touching the cache
+        return dict(result)
+    
+    def _cache_store(self, cache_key: str, entry: Tuple[float, Dict[str, Any]]):
+        """Keep an entry in memory, dropping expired entries and then the least recently used ones."""
+        with self._cache_lock:
+            self._cache[cache_key] = entry
+            self._cache.move_to_end(cache_key)
+            expired_before = time.time() - self.cache_ttl
+            for key in [key for key, (stored_at, _) in self._cache.items() if stored_at <= expired_before]:
+                del self._cache[key]
+            while len(self._cache) > RESULT_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+    
+    def _cache_put(self, cache_key: str, result: Dict[str, Any]):
+        """Store a result in memory and, if enabled, on disk."""
+        result = dict(result)
+        self._cache_store(cache_key, (time.time(), result))
+        
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent sessions never read a half-written file
+                cache_file = self.cache_dir / f"{cache_key}.pkl"
+                tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(result, f)
+                os.replace(tmp_file, cache_file)
+                self._sweep_cache_dir()
+            except Exception as e:
+                print(f"Failed to persist cached result: {e}")
+    
+    def _sweep_cache_dir(self):
+        """Delete persisted results older than the TTL, including ones whose key is never looked up again."""
+        expired_before = time.time() - self.cache_ttl
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            try:
+                if cache_file.stat().st_mtime <= expired_before:
+                    cache_file.unlink(missing_ok=True)
+            except OSError:
+                # Another process removed or replaced it first
+                continue
+    
     def get_improvement_summary(self, result: Dict[str, Any]) -> str:
         """
         Generate a human-readable summary of the CV analysis and improvements.
@@ -145,29 +418,52 @@ class CVImprovementAgent:
             Formatted summary string
         """
         
-        summary_parts = []
-        
-        # Overall score
-        if result.get("analysis_scores"):
-            overall_score = result["analysis_scores"].get("overall_score", 0)
-            summary_parts.append(f"Overall CV Score: {overall_score:.1%}")
-        
-        # Key findings
-        if result.get("identified_gaps"):
-            summary_parts.append(f"\nIdentified {len(result['identified_gaps'])} improvement areas:")
-            for gap in result["identified_gaps"][:3]:  # Show top 3
-                summary_parts.append(f"  • {gap}")
-        
-        # Applied improvements
-        if result.get("applied_improvements"):
-            summary_parts.append(f"\nApplied {len(result['applied_improvements'])} high-priority improvements")
-        
-        # Enhancement summary
-        if result.get("enhancement_summary"):
-            summary_parts.append(f"\n{result['enhancement_summary']}")
+        scores = result.get("analysis_scores")
+        gaps = result.get("identified_gaps")
+        applied = result.get("applied_improvements")
+        errors = result.get("processing_errors")
         
-        # Processing errors
-        if result.get("processing_errors"):
-            summary_parts.append(f"\nProcessing Issues: {len(result['processing_errors'])}")
+        # Each section is built in one piece; missing sections are dropped before the join
+        sections = [
+            # Overall score
+            f"Overall CV Score: {scores.get('overall_score', 0):.1%}" if scores else None,
+            # Key findings, top 3 gaps
+            "\n".join([f"Identified {len(gaps)} improvement areas:", *(f"  • {gap}" for gap in gaps[:3])])
+            if gaps else None,
+            # Applied improvements
+            f"Applied {len(applied)} high-priority improvements" if applied else None,
+            # Enhancement summary
+            result.get("enhancement_summary"),
+            # Processing errors
+            f"Processing Issues: {len(errors)}" if errors else None,
+        ]
         
-        return "\n".join(summary_parts) if summary_parts else "CV analysis completed successfully."
\ No newline at end of file
+        summary = "\n\n".join(filter(None, sections))
+        return summary or "CV analysis completed successfully."
+
+
+# Shared agent: the compiled graph is stateless and every call builds its own state
+# dict, so one instance can serve concurrent callers (e.g. all Streamlit sessions)
+_default_agent: Optional[CVImprovementAgent] = None
+_default_agent_lock = threading.Lock()
+
+
+def get_default_agent() -> CVImprovementAgent:
+    """
+    Return the process-wide agent, compiling the workflow on first use.
+    
+    Set CV_AGENT_CACHE_DIR to persist its result cache to disk so results
+    survive process restarts.
+    """
+    global _default_agent
+    if _default_agent is None:
+        with _default_agent_lock:
+            if _default_agent is None:
+                _default_agent = CVImprovementAgent(cache_dir=os.getenv("CV_AGENT_CACHE_DIR"))
+    return _default_agent
+
+
+def process_cv(cv_input: Union[str, bytes], target_role: str = None,
+               target_industry: str = None, file_format: Optional[str] = None) -> Dict[str, Any]:
+    """Process a CV with the shared agent; see CVImprovementAgent.process_cv."""
+    return get_default_agent().process_cv(cv_input, target_role, target_industry, file_format)
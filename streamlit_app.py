@@ -1,10 +1,18 @@
 import streamlit as st
+import difflib
+import math
 import os
+import random
+import re
 import sys
-import tempfile
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import singledispatch
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -12,13 +20,23 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 # Load environment variables
 load_dotenv()
 
-from src.cv_agent.workflow import CVImprovementAgent
-from src.cv_agent.tools.user_interaction import UserInteractionManager
-from src.cv_agent.tools.jd_analyzer import JobDescriptionAnalyzer
+# Workflow, LLM and analyzer modules are imported inside the cache_resource factories
+# below so the page renders before their import cost is paid
+from src.cv_agent.models.state import Improvement
 
-def create_sample_cv() -> str:
-    """Create a sample CV for testing."""
-    return """
+# Progress labels for each workflow node reported by CVImprovementAgent.stream_cv
+WORKFLOW_STEP_LABELS = {
+    "cache": "Loaded previous results for this CV",
+    "parse_cv": "Parsed CV sections",
+    "analyze_quality": "Analyzed CV quality",
+    "match_requirements": "Matched role requirements",
+    "generate_improvements": "Generated improvement suggestions",
+    "apply_improvements": "Applied high-priority improvements",
+    "quality_check": "Completed final quality check",
+}
+
+# Sample inputs offered in the app; kept as module constants so they are built once
+_SAMPLE_CV = """
 John Doe
 Email: john.doe@email.com
 Phone: (555) 123-4567
@@ -40,9 +58,7 @@ SKILLS
 Python, JavaScript, HTML, CSS
 """
 
-def create_sample_jd() -> str:
-    """Create a sample job description for testing."""
-    return """
+_SAMPLE_JD = """
 Senior Software Engineer - Full Stack Development
 
 About the Role:
@@ -80,59 +96,212 @@ Benefits:
 - Professional development budget
 """
 
+def create_sample_cv() -> str:
+    """Create a sample CV for testing."""
+    return _SAMPLE_CV
+
+def create_sample_jd() -> str:
+    """Create a sample job description for testing."""
+    return _SAMPLE_JD
+
+@st.cache_resource
+def get_agent():
+    """Build the CV improvement agent once per process and share it across sessions."""
+    from src.cv_agent.workflow import get_default_agent
+    return get_default_agent()
+
+@st.cache_resource
+def get_user_interaction_manager():
+    """Build the user interaction manager once per process; it holds no per-user state."""
+    from src.cv_agent.tools.user_interaction import UserInteractionManager
+    return UserInteractionManager()
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide worker pool for slow LLM calls, so they don't block script reruns.
+    Its size caps concurrent CV runs across all sessions; set CV_AGENT_MAX_WORKERS to tune it.
+    """
+    return ThreadPoolExecutor(max_workers=int(os.getenv("CV_AGENT_MAX_WORKERS", "4")))
+
+@st.cache_resource
+def get_jd_analyzer():
+    """Build the job description analyzer once per process; it holds no per-user state."""
+    from src.cv_agent.tools.jd_analyzer import JobDescriptionAnalyzer
+    return JobDescriptionAnalyzer()
+
+# Processed results are held in a process-wide LRU keyed by session id rather than in
+# session state, so idle tabs cannot grow server memory without bound. An evicted
+# session loses its results and is asked to process its CV again, which the agent's
+# result cache serves without the LLM.
+RESULTS_MAX_SESSIONS = 128
+
+@st.cache_resource
+def get_results_store() -> "OrderedDict[str, Dict[str, Any]]":
+    """Process-wide map of session id to processed result, least recently used first."""
+    return OrderedDict()
+
+@st.cache_resource
+def get_results_lock() -> threading.Lock:
+    """Guards get_results_store(); script threads of different sessions touch it concurrently."""
+    return threading.Lock()
+
+def get_processed_result() -> Optional[Dict[str, Any]]:
+    """Return this session's processed result, or None if there is none or it was evicted."""
+    session_id = get_script_run_ctx().session_id
+    store = get_results_store()
+    with get_results_lock():
+        result = store.get(session_id)
+        if result is not None:
+            store.move_to_end(session_id)
+    return result
+
+def set_processed_result(result: Dict[str, Any]):
+    """Store this session's processed result, evicting the least recently used sessions."""
+    session_id = get_script_run_ctx().session_id
+    store = get_results_store()
+    with get_results_lock():
+        store[session_id] = result
+        store.move_to_end(session_id)
+        while len(store) > RESULTS_MAX_SESSIONS:
+            store.popitem(last=False)
+
+def interaction_state(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the subset of a processed result the UserInteractionManager reads."""
+    return {
+        "parsed_sections": result.get("parsed_sections", {}),
+        "target_role": result.get("target_role"),
+        "target_industry": result.get("target_industry"),
+        "analysis_scores": result.get("analysis_scores"),
+        "identified_gaps": result.get("identified_gaps", [])
+    }
+
+# Chat caches persist to disk so answers survive restarts; Streamlit ignores ttl for
+# persisted caches, so they are bounded by entry count instead
+CHAT_CACHE_MAX_ENTRIES = 500
+
+@st.cache_data(persist="disk", max_entries=CHAT_CACHE_MAX_ENTRIES, show_spinner=False)
+def get_cached_questions(state: Dict[str, Any]) -> Dict[str, str]:
+    """Targeted questions for a CV, cached on the CV's interaction state."""
+    return get_user_interaction_manager().ask_for_more_information(state)
+
+@st.cache_data(persist="disk", max_entries=CHAT_CACHE_MAX_ENTRIES, show_spinner=False)
+def get_cached_suggestions(state: Dict[str, Any], user_responses: Dict[str, str]) -> list:
+    """Personalized suggestions, cached on the CV's interaction state and the user's answers."""
+    return get_user_interaction_manager().generate_specific_suggestions(state, user_responses)
+
+def normalize_jd_text(jd_text: str) -> str:
+    """Collapse whitespace and drop blank lines so reformatted copies of a posting share a cache key."""
+    return "\n".join(" ".join(line.split()) for line in jd_text.splitlines() if line.strip())
+
+# JD results persist to disk like the chat caches, bounded by entry count for the same reason
+JD_CACHE_MAX_ENTRIES = 1000
+
+@st.cache_data(persist="disk", max_entries=JD_CACHE_MAX_ENTRIES, show_spinner=False)
+def get_cached_jd_analysis(jd_text: str):
+    """Job description analysis, cached on the JD text so re-analyzing the same posting skips the LLM."""
+    return get_jd_analyzer().analyze_job_description(jd_text)
+
+@st.cache_data(persist="disk", max_entries=JD_CACHE_MAX_ENTRIES, show_spinner=False)
+def get_cached_jd_report(jd_text: str, parsed_sections: Dict[str, Any]) -> tuple:
+    """JD analysis, CV match and JD-specific suggestions, cached on the JD text and the CV's sections."""
+    analyzer = get_jd_analyzer()
+    cv_state = {"parsed_sections": parsed_sections}
+    jd_analysis = get_cached_jd_analysis(jd_text)
+    match_results = analyzer.match_cv_to_jd(cv_state, jd_analysis)
+    jd_suggestions = analyzer.generate_jd_specific_suggestions(cv_state, jd_analysis, match_results)
+    return jd_analysis, match_results, jd_suggestions
+
 def init_session_state():
     """Initialize session state variables."""
-    if "agent" not in st.session_state:
-        st.session_state.agent = CVImprovementAgent()
-    if "processed_result" not in st.session_state:
-        st.session_state.processed_result = None
-    if "user_interaction_manager" not in st.session_state:
-        st.session_state.user_interaction_manager = UserInteractionManager()
-    if "jd_analyzer" not in st.session_state:
-        st.session_state.jd_analyzer = JobDescriptionAnalyzer()
-    if "chat_messages" not in st.session_state:
-        st.session_state.chat_messages = []
-    if "questions_generated" not in st.session_state:
-        st.session_state.questions_generated = False
-    if "current_questions" not in st.session_state:
-        st.session_state.current_questions = {}
-    if "user_responses" not in st.session_state:
-        st.session_state.user_responses = {}
-    if "jd_analysis" not in st.session_state:
-        st.session_state.jd_analysis = None
-    if "jd_match_results" not in st.session_state:
-        st.session_state.jd_match_results = None
-    if "jd_suggestions" not in st.session_state:
-        st.session_state.jd_suggestions = None
+    # After the first run of a session this is a single membership check
+    if st.session_state.get("_initialized"):
+        return
+    
+    # Built per call so every session gets its own mutable containers
+    defaults = {
+        "cv_future": None,
+        "cv_progress": [],
+        "cv_error": None,
+        "chat_messages": [],
+        "questions_generated": False,
+        "current_questions": {},
+        "user_responses": {},
+        "answers_submitted": False,
+        "suggestions_future": None,
+        "jd_analysis": None,
+        "jd_match_results": None,
+        "jd_suggestions": None,
+    }
+    for key, value in defaults.items():
+        st.session_state.setdefault(key, value)
+    st.session_state._initialized = True
+
+# (label, key) pairs shown by display_analysis_scores, in display order
+SCORE_METRICS = (
+    ("Overall Score", "overall_score"),
+    ("ATS Compatibility", "ats_compatibility"),
+    ("Content Quality", "content_quality"),
+    ("Keyword Density", "keyword_density"),
+    ("Formatting", "formatting_score"),
+)
+
+def as_dict(obj) -> Dict[str, Any]:
+    """Normalize a Pydantic model to a dict once so callers can use plain key access."""
+    return obj.model_dump() if hasattr(obj, "model_dump") else obj
 
 def display_analysis_scores(scores):
     """Display analysis scores in a formatted way."""
     st.subheader("📊 CV Analysis Scores")
     
-    # Handle both Pydantic objects and dictionary formats
-    if hasattr(scores, 'overall_score'):  # Pydantic object
-        overall_score = scores.overall_score
-        ats_score = scores.ats_compatibility
-        content_score = scores.content_quality
-        keyword_score = scores.keyword_density
-        formatting_score = scores.formatting_score
-    else:  # Dictionary
-        overall_score = scores.get('overall_score', 0)
-        ats_score = scores.get('ats_compatibility', 0)
-        content_score = scores.get('content_quality', 0)
-        keyword_score = scores.get('keyword_density', 0)
-        formatting_score = scores.get('formatting_score', 0)
-    
-    col1, col2 = st.columns(2)
+    scores = as_dict(scores)
     
-    with col1:
-        st.metric("Overall Score", f"{overall_score:.1%}")
-        st.metric("ATS Compatibility", f"{ats_score:.1%}")
-        st.metric("Formatting", f"{formatting_score:.1%}")
+    # One row of metrics laid out in a single columns call
+    for col, (label, key) in zip(st.columns(len(SCORE_METRICS)), SCORE_METRICS):
+        col.metric(label, f"{scores.get(key, 0):.1%}")
+
+# Fallbacks for fields missing from LLM-produced improvement dicts
+IMPROVEMENT_DEFAULTS = {
+    "section": "General",
+    "type": "improvement",
+    "priority": "medium",
+    "confidence": 0,
+    "reasoning": "No description available",
+    "original_text": "",
+    "improved_text": ""
+}
+
+@singledispatch
+def _render_improvement(improvement: dict, index: int):
+    """Render one improvement record; dispatched on its type."""
+    # Pad missing fields once, then index directly
+    improvement = {**IMPROVEMENT_DEFAULTS, **improvement}
+    section = improvement['section']
+    improvement_type = improvement['type']
     
-    with col2:
-        st.metric("Content Quality", f"{content_score:.1%}")
-        st.metric("Keyword Density", f"{keyword_score:.1%}")
+    # Create expander with meaningful title
+    title = f"{section.title()} - {improvement_type.title()}"
+    with st.expander(f"Improvement {index+1}: {title}"):
+        st.write(f"**Section:** {section}")
+        st.write(f"**Type:** {improvement_type}")
+        st.write(f"**Priority:** {improvement['priority']}")
+        st.write(f"**Confidence:** {improvement['confidence']:.1%}")
+        st.write(f"**Reasoning:** {improvement['reasoning']}")
+        
+        if improvement['original_text']:
+            st.write("**Original Text:**")
+            st.code(improvement['original_text'], language="text")
+        
+        if improvement['improved_text']:
+            st.write("**Suggested Improvement:**")
+            st.code(improvement['improved_text'], language="text")
+
+@_render_improvement.register
+def _(improvement: Improvement, index: int):
+    _render_improvement(as_dict(improvement), index)
+
+# Improvements shown per page in the Analysis tab
+IMPROVEMENTS_PAGE_SIZE = 10
 
 def display_improvements(improvements: list):
     """Display suggested improvements."""
@@ -141,41 +310,16 @@ def display_improvements(improvements: list):
     
     st.subheader("💡 Suggested Improvements")
     
-    for i, improvement in enumerate(improvements):
-        # Handle both Pydantic objects and dictionary formats
-        if hasattr(improvement, 'section'):  # Pydantic object
-            section = improvement.section
-            improvement_type = improvement.type
-            priority = improvement.priority
-            confidence = improvement.confidence
-            reasoning = improvement.reasoning
-            original_text = improvement.original_text
-            improved_text = improvement.improved_text
-        else:  # Dictionary
-            section = improvement.get('section', 'General')
-            improvement_type = improvement.get('type', 'improvement')
-            priority = improvement.get('priority', 'medium')
-            confidence = improvement.get('confidence', 0)
-            reasoning = improvement.get('reasoning', 'No description available')
-            original_text = improvement.get('original_text', '')
-            improved_text = improvement.get('improved_text', '')
-        
-        # Create expander with meaningful title
-        title = f"{section.title()} - {improvement_type.title()}"
-        with st.expander(f"Improvement {i+1}: {title}"):
-            st.write(f"**Section:** {section}")
-            st.write(f"**Type:** {improvement_type}")
-            st.write(f"**Priority:** {priority}")
-            st.write(f"**Confidence:** {confidence:.1%}")
-            st.write(f"**Reasoning:** {reasoning}")
-            
-            if original_text:
-                st.write("**Original Text:**")
-                st.code(original_text, language="text")
-            
-            if improved_text:
-                st.write("**Suggested Improvement:**")
-                st.code(improved_text, language="text")
+    # Render one page at a time so long lists don't mount an expander per improvement
+    start = 0
+    if len(improvements) > IMPROVEMENTS_PAGE_SIZE:
+        pages = math.ceil(len(improvements) / IMPROVEMENTS_PAGE_SIZE)
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="improvements_page")
+        start = (page - 1) * IMPROVEMENTS_PAGE_SIZE
+    
+    # process_cv normalizes improvements to dicts; Improvement models are still accepted
+    for i, improvement in enumerate(improvements[start:start + IMPROVEMENTS_PAGE_SIZE], start):
+        _render_improvement(improvement, i)
 
 def display_enhanced_cv(enhanced_cv: str):
     """Display the enhanced CV."""
@@ -183,15 +327,69 @@ def display_enhanced_cv(enhanced_cv: str):
         return
     
     st.subheader("✨ Enhanced CV")
-    st.text_area("Enhanced CV Content", enhanced_cv, height=400)
+    # Read-only display; a text_area would register widget state holding the whole CV
+    st.code(enhanced_cv, language="text")
+    st.download_button("Download Enhanced CV", enhanced_cv, file_name="enhanced_cv.txt", mime="text/plain")
+
+# Terms whose presence in the enhanced CV signals an improvement of each kind
+IMPROVEMENT_INDICATORS = {
+    "quantified": ["increased", "decreased", "improved", "%", "$", "managed"],
+    "action_words": ["developed", "implemented", "led", "created", "designed", "optimized"],
+    "technical": ["API", "database", "framework", "technology", "system"],
+    "skills": ["Python", "JavaScript", "SQL", "AWS", "React", "Node.js"]
+}
+
+# Word tokens, keeping inner dots and #/+ so "node.js", "c#" and "c++" stay whole
+CV_TOKEN_PATTERN = re.compile(r"[a-z0-9#+]+(?:\.[a-z0-9#+]+)*")
+
+def count_indicator_terms(keywords: list, tokens: Counter, text_low: str) -> int:
+    """Count how many keywords appear in a CV, given its token counts and lowercased text."""
+    return sum(
+        1 for word in keywords
+        if (tokens[word.lower()] if word.isalnum() or "." in word else word in text_low)
+    )
+
+@st.cache_data(show_spinner=False)
+def get_cv_comparison_stats(original_cv: str, enhanced_cv: str) -> Dict[str, Any]:
+    """Word counts, word-level diff and improvement-term counts for a CV pair, cached so reruns skip the text scans."""
+    original_low = original_cv.lower()
+    enhanced_low = enhanced_cv.lower()
+    original_tokens = Counter(CV_TOKEN_PATTERN.findall(original_low))
+    enhanced_tokens = Counter(CV_TOKEN_PATTERN.findall(enhanced_low))
+    original_words = original_cv.split()
+    enhanced_words = enhanced_cv.split()
+    
+    # Word-level diff; autojunk off so common words in long CVs are still matched
+    matcher = difflib.SequenceMatcher(None, original_words, enhanced_words, autojunk=False)
+    words_added = words_removed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            words_removed += i2 - i1
+            words_added += j2 - j1
+    
+    return {
+        "original_words": len(original_words),
+        "enhanced_words": len(enhanced_words),
+        "words_added": words_added,
+        "words_removed": words_removed,
+        "similarity": matcher.ratio(),
+        "indicator_counts": {
+            category: (
+                count_indicator_terms(keywords, original_tokens, original_low),
+                count_indicator_terms(keywords, enhanced_tokens, enhanced_low)
+            )
+            for category, keywords in IMPROVEMENT_INDICATORS.items()
+        }
+    }
 
 def display_cv_before_after_comparison():
     """Display before and after CV comparison side by side."""
-    if not st.session_state.processed_result:
+    result = get_processed_result()
+    if not result:
         return
     
-    original_cv = st.session_state.processed_result.get("original_cv_text", "")
-    enhanced_cv = st.session_state.processed_result.get("enhanced_cv", "")
+    original_cv = result.get("original_cv_text", "")
+    enhanced_cv = result.get("enhanced_cv", "")
     
     if not original_cv and not enhanced_cv:
         st.info("No CV comparison available. Process a CV to see before/after comparison.")
@@ -199,80 +397,61 @@ def display_cv_before_after_comparison():
     
     st.subheader("📊 Before vs After Comparison")
     
-    # Create tabs for different view modes
-    tab1, tab2, tab3, tab4 = st.tabs(["Side by Side", "Before Only", "After Only", "Key Changes"])
+    # Derived counts are cached per CV pair and shared by Key Changes and the Improvement Summary
+    stats = get_cv_comparison_stats(original_cv, enhanced_cv)
+    
+    # Radio instead of tabs: tabs execute every view on each rerun, this renders only the selected one
+    view = st.radio("View", ["Side by Side", "Before Only", "After Only", "Key Changes"], horizontal=True, key="comparison_view")
     
-    with tab1:
+    # Read-only st.code rather than text_area, which would sync each CV as widget state
+    if view == "Side by Side":
         if original_cv or enhanced_cv:
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("### 📝 **Original CV**")
                 if original_cv:
-                    st.text_area("Original CV", original_cv, height=500, key="original_cv_display")
+                    st.code(original_cv, language="text")
                 else:
                     st.info("Original CV content not available")
             
             with col2:
                 st.markdown("### ✨ **Enhanced CV**")
                 if enhanced_cv:
-                    st.text_area("Enhanced CV", enhanced_cv, height=500, key="enhanced_cv_display")
+                    st.code(enhanced_cv, language="text")
                 else:
                     st.info("Enhanced CV not yet generated")
     
-    with tab2:
+    elif view == "Before Only":
         st.markdown("### 📝 **Original CV**")
         if original_cv:
-            st.text_area("Original CV Content", original_cv, height=600, key="original_only")
+            st.code(original_cv, language="text")
         else:
             st.info("Original CV content not available")
     
-    with tab3:
+    elif view == "After Only":
         st.markdown("### ✨ **Enhanced CV**")
         if enhanced_cv:
-            st.text_area("Enhanced CV Content", enhanced_cv, height=600, key="enhanced_only")
+            st.code(enhanced_cv, language="text")
         else:
             st.info("Enhanced CV not yet generated")
     
-    with tab4:
+    else:
         st.markdown("### 🔍 **Key Changes Analysis**")
         if original_cv and enhanced_cv:
-            # Simple change detection - could be enhanced with proper diff algorithms
-            original_sections = original_cv.split('\n\n')
-            enhanced_sections = enhanced_cv.split('\n\n')
-            
             st.markdown("**Notable Changes:**")
             
-            # Basic change analysis
-            if len(enhanced_sections) > len(original_sections):
-                st.success(f"✅ **Added {len(enhanced_sections) - len(original_sections)} new sections**")
-            elif len(enhanced_sections) < len(original_sections):
-                st.info(f"📝 **Consolidated {len(original_sections) - len(enhanced_sections)} sections**")
-            
-            # Word count changes
-            original_words = original_cv.split()
-            enhanced_words = enhanced_cv.split()
-            word_diff = len(enhanced_words) - len(original_words)
-            
-            if word_diff > 0:
-                st.success(f"✅ **Added {word_diff} words** for more detailed descriptions")
-            elif word_diff < 0:
-                st.info(f"📝 **Reduced by {abs(word_diff)} words** for better conciseness")
-            else:
-                st.info("📊 **Maintained similar length** while improving content quality")
+            # Word-level diff between the two versions
+            if stats["words_added"]:
+                st.success(f"✅ **Added {stats['words_added']} words** of new or reworded content")
+            if stats["words_removed"]:
+                st.info(f"📝 **Removed or reworded {stats['words_removed']} words**")
+            if not stats["words_added"] and not stats["words_removed"]:
+                st.info("📊 **No wording changes** between the original and enhanced CV")
+            st.caption(f"Wording similarity to the original: {stats['similarity']:.0%}")
             
             # Check for specific improvements
-            improvement_indicators = {
-                "quantified": ["increased", "decreased", "improved", "%", "$", "managed"],
-                "action_words": ["developed", "implemented", "led", "created", "designed", "optimized"],
-                "technical": ["API", "database", "framework", "technology", "system"],
-                "skills": ["Python", "JavaScript", "SQL", "AWS", "React", "Node.js"]
-            }
-            
-            for category, keywords in improvement_indicators.items():
-                original_count = sum(1 for word in keywords if word.lower() in original_cv.lower())
-                enhanced_count = sum(1 for word in keywords if word.lower() in enhanced_cv.lower())
-                
+            for category, (original_count, enhanced_count) in stats["indicator_counts"].items():
                 if enhanced_count > original_count:
                     improvement = enhanced_count - original_count
                     category_name = category.replace("_", " ").title()
@@ -285,8 +464,8 @@ def display_cv_before_after_comparison():
         st.subheader("📈 Improvement Summary")
         
         # Calculate basic metrics
-        original_length = len(original_cv.split())
-        enhanced_length = len(enhanced_cv.split())
+        original_length = stats["original_words"]
+        enhanced_length = stats["enhanced_words"]
         length_change = enhanced_length - original_length
         
         col1, col2, col3 = st.columns(3)
@@ -298,17 +477,31 @@ def display_cv_before_after_comparison():
             st.metric("Word Count Change", length_change, delta=length_change)
         
         # Show key improvements if available
-        if st.session_state.processed_result.get("suggested_improvements"):
+        if result.get("suggested_improvements"):
             st.markdown("**Key Improvements Applied:**")
-            improvements = st.session_state.processed_result["suggested_improvements"]
-            for i, improvement in enumerate(improvements[:5], 1):  # Show top 5
-                if hasattr(improvement, 'reasoning'):
-                    st.write(f"{i}. {improvement.reasoning}")
-                elif isinstance(improvement, dict):
-                    st.write(f"{i}. {improvement.get('reasoning', 'Improvement applied')}")
+            improvements = result["suggested_improvements"]
+            for i, improvement in enumerate(map(as_dict, improvements[:5]), 1):  # Show top 5
+                st.write(f"{i}. {improvement.get('reasoning', 'Improvement applied')}")
+
+@st.fragment
+def display_chat_tab():
+    """
+    Chat tab content, run as a fragment so a chat turn only reruns this tab
+    instead of the whole page. Personalized suggestions are included because
+    they are produced by the chat.
+    """
+    # Interactive chat interface
+    display_chat_interface()
+    
+    # Suggestions are generated off the script thread; poll until they arrive
+    if st.session_state.get("suggestions_future"):
+        poll_personalized_suggestions()
+    
+    # Display personalized suggestions if available
+    display_personalized_suggestions()
 
 def display_chat_interface():
-    """Display interactive chat interface for gathering user information."""
+    """Display interactive chat interface for gathering user information; must run inside display_chat_tab."""
     st.subheader("💬 CV Enhancement Chat")
     
     # Display existing chat messages
@@ -317,148 +510,153 @@ def display_chat_interface():
             st.write(message["content"])
     
     # Generate questions if CV has been processed and questions haven't been generated yet
-    if (st.session_state.processed_result and 
+    result = get_processed_result()
+    if (result and 
         not st.session_state.questions_generated and 
-        st.session_state.processed_result.get("parsed_sections")):
+        result.get("parsed_sections")):
         
-        # Create a mock state object for the UserInteractionManager
-        mock_state = {
-            "parsed_sections": st.session_state.processed_result.get("parsed_sections", {}),
-            "target_role": st.session_state.processed_result.get("target_role"),
-            "target_industry": st.session_state.processed_result.get("target_industry"),
-            "analysis_scores": st.session_state.processed_result.get("analysis_scores"),
-            "identified_gaps": st.session_state.processed_result.get("identified_gaps", [])
-        }
-        
-        # Generate questions
-        questions = st.session_state.user_interaction_manager.ask_for_more_information(mock_state)
-        st.session_state.current_questions = questions
+        # Mark generation as started before the call so an overlapping rerun can't trigger it twice
         st.session_state.questions_generated = True
+        try:
+            # Generate questions; cached so an unchanged CV never pays for them twice
+            questions = get_cached_questions(interaction_state(result))
+        except Exception:
+            st.session_state.questions_generated = False
+            raise
+        st.session_state.current_questions = questions
         
         # Add initial bot message
         if questions:
             num_questions = len(questions)
-            bot_message = f"Great! I've analyzed your CV and have {num_questions} targeted questions to help create personalized improvement suggestions. This should only take a couple of minutes."
+            bot_message = f"Great! I've analyzed your CV and have {num_questions} targeted questions to help create personalized improvement suggestions. Answer them below and submit once - this should only take a couple of minutes."
             st.session_state.chat_messages.append({"role": "assistant", "content": bot_message})
-            
-            # Add first question
-            first_question = list(questions.values())[0]
-            st.session_state.chat_messages.append({"role": "assistant", "content": first_question})
-            st.rerun()
+            # Drawn in place: this can run in a full-app run, where a fragment-scoped rerun is not allowed
+            with st.chat_message("assistant"):
+                st.write(bot_message)
     
-    # Chat input
+    # All questions are answered in one form so suggestions are generated in a single pass
+    unanswered_questions = {
+        key: question for key, question in st.session_state.current_questions.items()
+        if key not in st.session_state.user_responses
+    }
+    if unanswered_questions and not st.session_state.answers_submitted:
+        with st.form("answers"):
+            for key, question in unanswered_questions.items():
+                st.text_area(question, key=f"ans_{key}")
+            submitted = st.form_submit_button("Submit answers", type="primary")
+        
+        if submitted:
+            handle_form_answers(unanswered_questions)
+            st.rerun(scope="fragment")
+        return
+    
+    # Chat input; the new turn is drawn in place instead of rerunning to redraw the history
     if prompt := st.chat_input("Your response..."):
         # Add user message
         st.session_state.chat_messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.write(prompt)
         
-        # Process user response
-        handle_user_response(prompt)
-        
-        st.rerun()
+        # Process user response and stream the reply
+        response_text = handle_user_response(prompt)
+        with st.chat_message("assistant"):
+            st.write_stream(stream_words(response_text))
 
-def handle_user_response(response: str):
-    """Handle user response and generate appropriate follow-up with intelligent conversation flow."""
-    current_questions = st.session_state.current_questions
+def handle_form_answers(questions: Dict[str, str]):
+    """Record all answers submitted through the questions form and generate suggestions once."""
     responses = st.session_state.user_responses
     
-    if current_questions:
-        # Map response to current question
-        unanswered_questions = [key for key in current_questions.keys() if key not in responses]
+    for key, question in questions.items():
+        answer = st.session_state.get(f"ans_{key}", "").strip()
+        if not answer:
+            continue  # Skipped questions are not asked again
         
-        if unanswered_questions:
-            current_key = unanswered_questions[0]
-            responses[current_key] = response
-            
-            # Generate contextual acknowledgment
-            acknowledgment = generate_contextual_acknowledgment(current_key, response)
-            st.session_state.chat_messages.append({"role": "assistant", "content": acknowledgment})
-            
-            # Check if there are more questions
-            remaining_questions = [key for key in current_questions.keys() if key not in responses]
-            
-            if remaining_questions:
-                # Ask next question with smooth transition
-                next_key = remaining_questions[0]
-                next_question = current_questions[next_key]
-                
-                # Add transition if needed
-                transition = generate_question_transition(current_key, next_key, response)
-                if transition:
-                    st.session_state.chat_messages.append({"role": "assistant", "content": transition})
-                
-                st.session_state.chat_messages.append({"role": "assistant", "content": next_question})
-            else:
-                # All questions answered, generate personalized suggestions
-                completion_message = "Perfect! I now have all the information I need. Let me generate personalized suggestions based on your responses..."
-                st.session_state.chat_messages.append({"role": "assistant", "content": completion_message})
-                generate_personalized_suggestions()
-        else:
-            # All questions answered, handle follow-up conversation
-            handle_followup_conversation(response)
+        responses[key] = answer
+        st.session_state.chat_messages.append({"role": "user", "content": f"**{question}**\n\n{answer}"})
+        st.session_state.chat_messages.append({
+            "role": "assistant",
+            "content": generate_contextual_acknowledgment(key, answer)
+        })
+    
+    st.session_state.answers_submitted = True
+    
+    completion_message = "Perfect! I now have all the information I need. Let me generate personalized suggestions based on your responses..."
+    st.session_state.chat_messages.append({"role": "assistant", "content": completion_message})
+    generate_personalized_suggestions()
+
+def handle_user_response(response: str) -> str:
+    """Handle a chat message sent after the targeted questions were answered; returns the reply."""
+    return handle_followup_conversation(response)
+
+def stream_words(text: str):
+    """Yield a message word by word for st.write_stream."""
+    for word in text.split(" "):
+        yield word + " "
+
+# Chat acknowledgments per question key; {response} is filled with the user's answer
+ACKNOWLEDGMENT_TEMPLATES = {
+    "target_role": "Great! Focusing on {response} roles will help me provide targeted advice.",
+    "target_industry": "Excellent! The {response} industry has specific requirements I can address.",
+    "professional_summary": "That's helpful context for strengthening your professional summary.",
+    "key_skills": "Those skills will be important to highlight effectively.",
+    "work_experience": "Thanks for sharing that experience - it gives me insight into your background.",
+    "experience_details": "Those details will help make your experience section much more compelling.",
+    "achievements": "Fantastic! Quantifiable achievements like these make a huge difference.",
+    "career_stage": "Understanding your career stage helps me tailor my recommendations.",
+    "application_context": "This context will help me provide more targeted suggestions."
+}
+
+# Simple follow-up responses for additional conversation
+FOLLOWUP_RESPONSES = [
+    "I've noted that additional information. Is there anything specific about your CV you'd like me to focus on?",
+    "Thanks for the extra context! This will help refine my suggestions.",
+    "That's useful information. Feel free to share any other details you think would be helpful.",
+    "Got it! Any other aspects of your job search you'd like assistance with?"
+]
 
 def generate_contextual_acknowledgment(question_key: str, response: str) -> str:
     """Generate contextual acknowledgment based on the question type and response."""
-    acknowledgments = {
-        "target_role": f"Great! Focusing on {response} roles will help me provide targeted advice.",
-        "target_industry": f"Excellent! The {response} industry has specific requirements I can address.",
-        "professional_summary": "That's helpful context for strengthening your professional summary.",
-        "key_skills": "Those skills will be important to highlight effectively.",
-        "work_experience": "Thanks for sharing that experience - it gives me insight into your background.",
-        "experience_details": "Those details will help make your experience section much more compelling.",
-        "achievements": "Fantastic! Quantifiable achievements like these make a huge difference.",
-        "career_stage": "Understanding your career stage helps me tailor my recommendations.",
-        "application_context": "This context will help me provide more targeted suggestions."
-    }
-    
-    return acknowledgments.get(question_key, "Thank you for that information!")
+    template = ACKNOWLEDGMENT_TEMPLATES.get(question_key)
+    if template is None:
+        return "Thank you for that information!"
+    return template.format(response=response)
 
-def generate_question_transition(current_key: str, next_key: str, response: str) -> Optional[str]:
-    """Generate smooth transitions between questions."""
-    # Special case for industry transition that uses response
-    if current_key == "target_industry" and next_key == "key_skills":
-        return f"For the {response} industry, technical skills are crucial."
-    
-    transitions = {
-        ("target_role", "target_industry"): None,  # Already contextual
-        ("target_role", "professional_summary"): "Now let's work on making your CV stand out for these roles.",
-        ("professional_summary", "key_skills"): "Next, let's ensure your key skills are properly showcased.",
-        ("key_skills", "achievements"): "Now I'd like to help you quantify your impact.",
-        ("work_experience", "achievements"): "Let's add some concrete numbers to make your experience more impressive.",
-    }
-    
-    return transitions.get((current_key, next_key))
-
-def handle_followup_conversation(response: str):
-    """Handle ongoing conversation after initial questions."""
-    # Simple follow-up responses for additional conversation
-    followup_responses = [
-        "I've noted that additional information. Is there anything specific about your CV you'd like me to focus on?",
-        "Thanks for the extra context! This will help refine my suggestions.",
-        "That's useful information. Feel free to share any other details you think would be helpful.",
-        "Got it! Any other aspects of your job search you'd like assistance with?"
-    ]
-    
-    import random
-    response_text = random.choice(followup_responses)
+def handle_followup_conversation(response: str) -> str:
+    """Handle ongoing conversation after initial questions; records and returns the reply."""
+    response_text = random.choice(FOLLOWUP_RESPONSES)
     st.session_state.chat_messages.append({"role": "assistant", "content": response_text})
+    return response_text
 
 def generate_personalized_suggestions():
-    """Generate personalized suggestions based on user responses."""
+    """Start generating personalized suggestions from the user's responses in the background."""
+    result = get_processed_result()
+    if result is None:
+        # The session's result was evicted from the results store while it sat idle
+        st.session_state.chat_messages.append({
+            "role": "assistant",
+            "content": "Your processed CV has expired. Please upload it and click Process CV again to get personalized suggestions."
+        })
+        return
+    
+    st.session_state.suggestions_future = get_executor().submit(
+        get_cached_suggestions,
+        interaction_state(result),
+        dict(st.session_state.user_responses)
+    )
+
+@st.fragment(run_every=1)
+def poll_personalized_suggestions():
+    """Check once a second whether background suggestion generation has finished."""
+    future = st.session_state.get("suggestions_future")
+    if future is None:
+        return
+    if not future.done():
+        st.caption("⏳ Generating personalized suggestions...")
+        return
+    
+    st.session_state.suggestions_future = None
     try:
-        # Create state object with user responses
-        mock_state = {
-            "parsed_sections": st.session_state.processed_result.get("parsed_sections", {}),
-            "target_role": st.session_state.processed_result.get("target_role"),
-            "target_industry": st.session_state.processed_result.get("target_industry"),
-            "analysis_scores": st.session_state.processed_result.get("analysis_scores"),
-            "identified_gaps": st.session_state.processed_result.get("identified_gaps", [])
-        }
-        
-        # Generate suggestions with user responses
-        suggestions = st.session_state.user_interaction_manager.generate_specific_suggestions(
-            mock_state, 
-            st.session_state.user_responses
-        )
+        suggestions = future.result()
         
         # Store suggestions in session state
         st.session_state.personalized_suggestions = suggestions
@@ -474,24 +672,43 @@ def generate_personalized_suggestions():
             "role": "assistant",
             "content": f"I encountered an issue generating personalized suggestions: {str(e)}. However, you can still see the general improvements above."
         })
+    
+    # Refresh the page so the chat history and suggestions pick up the result
+    st.rerun()
 
 def display_personalized_suggestions():
     """Display personalized suggestions generated from chat responses."""
-    if not hasattr(st.session_state, 'personalized_suggestions') or not st.session_state.personalized_suggestions:
+    suggestions = st.session_state.get("personalized_suggestions")
+    if not suggestions:
         return
     
     st.subheader("🎯 Personalized Suggestions")
     st.write("Based on our conversation, here are tailored recommendations:")
     
-    for i, suggestion in enumerate(st.session_state.personalized_suggestions, 1):
+    for i, suggestion in enumerate(suggestions, 1):
         with st.expander(f"Suggestion {i}: {suggestion.get('title', 'Recommendation')}"):
             st.write(f"**Priority:** {suggestion.get('priority', 'medium').title()}")
             st.write(f"**Why:** {suggestion.get('reason', 'No reason provided')}")
             st.write(f"**Action:** {suggestion.get('action', 'No action specified')}")
             st.write(f"**Expected Impact:** {suggestion.get('impact', 'Impact not specified')}")
 
+@st.fragment
+def display_jd_tab():
+    """
+    Job description tab content, run as a fragment so analyzing a JD only
+    reruns this tab instead of the whole page.
+    """
+    # Job Description Analysis
+    display_jd_interface()
+    
+    # Display JD analysis results
+    display_jd_analysis_results()
+    
+    # Display JD-specific suggestions
+    display_jd_specific_suggestions()
+
 def display_jd_interface():
-    """Display job description input and analysis interface."""
+    """Display job description input and analysis interface; must run inside display_jd_tab."""
     st.subheader("💼 Job Description Analysis")
     
     # Sample JD option
@@ -518,35 +735,26 @@ def display_jd_interface():
     with col1:
         analyze_jd = st.button("🔍 Analyze JD", type="primary")
     
-    if analyze_jd and jd_text and st.session_state.processed_result:
+    result = get_processed_result()
+    if analyze_jd and jd_text and result:
         with st.spinner("Analyzing job description and matching against your CV..."):
             try:
-                # Analyze job description
-                jd_analysis = st.session_state.jd_analyzer.analyze_job_description(jd_text)
-                st.session_state.jd_analysis = jd_analysis
-                
-                # Match CV against JD
-                match_results = st.session_state.jd_analyzer.match_cv_to_jd(
-                    st.session_state.processed_result, 
-                    jd_analysis
+                # Analyze the JD, match the CV against it and generate JD-specific suggestions
+                jd_analysis, match_results, jd_suggestions = get_cached_jd_report(
+                    normalize_jd_text(jd_text),
+                    result.get("parsed_sections", {})
                 )
+                st.session_state.jd_analysis = jd_analysis
                 st.session_state.jd_match_results = match_results
-                
-                # Generate JD-specific suggestions
-                jd_suggestions = st.session_state.jd_analyzer.generate_jd_specific_suggestions(
-                    st.session_state.processed_result,
-                    jd_analysis,
-                    match_results
-                )
                 st.session_state.jd_suggestions = jd_suggestions
                 
                 st.success("Job description analyzed successfully!")
-                st.rerun()
+                st.rerun(scope="fragment")
                 
             except Exception as e:
                 st.error(f"Error analyzing job description: {str(e)}")
     
-    elif analyze_jd and not st.session_state.processed_result:
+    elif analyze_jd and not result:
         st.warning("Please process your CV first before analyzing job descriptions.")
     elif analyze_jd and not jd_text:
         st.warning("Please paste a job description to analyze.")
@@ -615,10 +823,11 @@ def display_jd_specific_suggestions():
     st.subheader("💡 Job-Specific Recommendations")
     st.write("Based on this job description, here are targeted improvements:")
     
-    # Group suggestions by priority
-    high_priority = [s for s in st.session_state.jd_suggestions if s.get('priority', '').lower() == 'high']
-    medium_priority = [s for s in st.session_state.jd_suggestions if s.get('priority', '').lower() == 'medium']
-    low_priority = [s for s in st.session_state.jd_suggestions if s.get('priority', '').lower() == 'low']
+    # Group suggestions by priority in a single pass
+    by_priority = defaultdict(list)
+    for suggestion in st.session_state.jd_suggestions:
+        by_priority[suggestion.get('priority', '').lower()].append(suggestion)
+    high_priority, medium_priority, low_priority = by_priority['high'], by_priority['medium'], by_priority['low']
     
     # Display high priority first
     if high_priority:
@@ -647,6 +856,58 @@ def display_jd_specific_suggestions():
                 st.write(f"**Action Steps:** {suggestion.get('action', 'No action specified')}")
                 st.write(f"**Expected Impact:** {suggestion.get('impact', 'Impact not specified')}")
 
+def run_cv_processing(agent, progress: list, cv_input, target_role: Optional[str],
+                      target_industry: Optional[str], file_format: Optional[str]) -> Dict[str, Any]:
+    """
+    Run the workflow on a worker thread, appending (node_name, overall_score) to
+    progress as each node completes. Returns the final result.
+    """
+    result = None
+    for node_name, result in agent.stream_cv(
+        cv_input=cv_input,
+        target_role=target_role,
+        target_industry=target_industry,
+        file_format=file_format
+    ):
+        # Surface the score as soon as analysis finishes, before improvements are ready
+        scores = result.get("analysis_scores") if node_name == "analyze_quality" else None
+        progress.append((node_name, scores["overall_score"] if scores else None))
+    
+    # Store original CV text for before/after comparison; this aliases raw_text rather than copying it.
+    # The app passes uploads as bytes, so a str input is always pasted or sample CV text, never a path
+    result["original_cv_text"] = result.get("raw_text") or (cv_input if isinstance(cv_input, str) else "")
+    return result
+
+@st.fragment(run_every=1)
+def poll_cv_processing():
+    """Report background CV processing progress once a second and pick up the result."""
+    future = st.session_state.get("cv_future")
+    if future is None:
+        return
+    
+    with st.status("Processing CV... This may take a few moments.", expanded=True) as status:
+        # Replay completed workflow steps
+        for node_name, overall_score in list(st.session_state.cv_progress):
+            step_label = WORKFLOW_STEP_LABELS.get(node_name, node_name)
+            status.write(f"✅ {step_label}")
+            status.update(label=f"Processing CV... {step_label}")
+            if overall_score is not None:
+                status.write(f"Overall CV score: {overall_score:.1%}")
+        
+        if not future.done():
+            return
+        
+        st.session_state.cv_future = None
+        try:
+            set_processed_result(future.result())
+            status.update(label="CV processed successfully!", state="complete", expanded=False)
+        except Exception as e:
+            status.update(label="CV processing failed", state="error")
+            st.session_state.cv_error = f"Error processing CV: {str(e)}"
+    
+    # Refresh the page so the results column picks up the new result or error
+    st.rerun()
+
 def main():
     st.set_page_config(
         page_title="CV Improvement Agent",
@@ -659,38 +920,41 @@ def main():
     
     init_session_state()
     
-    # Sidebar for configuration
-    st.sidebar.header("Configuration")
-    target_role = st.sidebar.text_input("Target Role", placeholder="e.g., Software Engineer")
-    target_industry = st.sidebar.text_input("Target Industry", placeholder="e.g., Technology")
-    
     # Main content area
     col1, col2 = st.columns([1, 2])
     
     with col1:
         st.header("Upload CV")
         
-        # File upload
-        uploaded_file = st.file_uploader(
-            "Choose a CV file",
-            type=['pdf', 'docx', 'txt'],
-            help="Upload your CV in PDF, DOCX, or TXT format"
-        )
-        
-        # Text input option
-        st.write("Or paste your CV content:")
-        cv_text = st.text_area("CV Text", height=200)
-        
-        # Sample CV option
-        use_sample = st.checkbox("Use sample CV for testing")
+        # Inputs, including the target role and industry, are batched in a form so editing
+        # them doesn't rerun the page until Process is clicked
+        with st.form("process_form"):
+            # Optimization targets
+            target_role = st.text_input("Target Role", placeholder="e.g., Software Engineer")
+            target_industry = st.text_input("Target Industry", placeholder="e.g., Technology")
+            
+            # File upload
+            uploaded_file = st.file_uploader(
+                "Choose a CV file",
+                type=['pdf', 'docx', 'txt'],
+                help="Upload your CV in PDF, DOCX, or TXT format"
+            )
+            
+            # Text input option
+            st.write("Or paste your CV content:")
+            cv_text = st.text_area("CV Text", height=200)
+            
+            # Sample CV option
+            use_sample = st.checkbox("Use sample CV for testing")
+            
+            submitted = st.form_submit_button("Process CV", type="primary", disabled=st.session_state.cv_future is not None)
         
-        # Process button
-        if st.button("Process CV", type="primary"):
+        if submitted:
+            file_format = None
             if uploaded_file is not None:
-                # Save uploaded file to temporary location
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    cv_input = tmp_file.name
+                # Parse the upload in memory; no temporary file needed
+                cv_input = uploaded_file.getvalue()
+                file_format = uploaded_file.name.rsplit(".", 1)[-1].lower()
             elif cv_text:
                 cv_input = cv_text
             elif use_sample:
@@ -699,38 +963,41 @@ def main():
                 st.error("Please upload a file, paste CV text, or use sample CV")
                 return
             
-            # Process CV with loading indicator
-            with st.spinner("Processing CV... This may take a few moments."):
-                try:
-                    result = st.session_state.agent.process_cv(
-                        cv_input=cv_input,
-                        target_role=target_role if target_role else None,
-                        target_industry=target_industry if target_industry else None
-                    )
-                    # Store original CV text for before/after comparison
-                    result["original_cv_text"] = result.get("raw_text", cv_input if isinstance(cv_input, str) and not cv_input.startswith("/") else "")
-                    st.session_state.processed_result = result
-                    st.success("CV processed successfully!")
-                except Exception as e:
-                    st.error(f"Error processing CV: {str(e)}")
-                finally:
-                    # Clean up temporary file if it exists
-                    if uploaded_file is not None and 'cv_input' in locals():
-                        try:
-                            os.unlink(cv_input)
-                        except:
-                            pass
+            # Process CV in the background so the page stays responsive; progress is polled below
+            progress = []
+            st.session_state.cv_progress = progress
+            st.session_state.cv_error = None
+            st.session_state.cv_future = get_executor().submit(
+                run_cv_processing,
+                get_agent(),
+                progress,
+                cv_input,
+                target_role if target_role else None,
+                target_industry if target_industry else None,
+                file_format
+            )
+        
+        if st.session_state.cv_future:
+            poll_cv_processing()
+        elif st.session_state.cv_error:
+            st.error(st.session_state.cv_error)
     
     with col2:
         st.header("Results")
         
-        if st.session_state.processed_result:
-            result = st.session_state.processed_result
+        result = get_processed_result()
+        if result:
             
-            # Create tabs for better organization
-            tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Analysis", "💬 Chat Enhancement", "💼 Job Matching", "📊 Before/After", "✨ Final Results"])
+            # Section selector rather than tabs so only the visible section runs on each rerun
+            view = st.radio(
+                "Results section",
+                ["📊 Analysis", "💬 Chat Enhancement", "💼 Job Matching", "📊 Before/After", "✨ Final Results"],
+                horizontal=True,
+                key="results_view",
+                label_visibility="collapsed"
+            )
             
-            with tab1:
+            if view == "📊 Analysis":
                 # Display analysis scores
                 if result.get("analysis_scores"):
                     display_analysis_scores(result["analysis_scores"])
@@ -750,28 +1017,17 @@ def main():
                 if result.get("suggested_improvements"):
                     display_improvements(result["suggested_improvements"])
             
-            with tab2:
-                # Interactive chat interface
-                display_chat_interface()
-                
-                # Display personalized suggestions if available
-                display_personalized_suggestions()
+            elif view == "💬 Chat Enhancement":
+                display_chat_tab()
             
-            with tab3:
-                # Job Description Analysis
-                display_jd_interface()
-                
-                # Display JD analysis results
-                display_jd_analysis_results()
-                
-                # Display JD-specific suggestions
-                display_jd_specific_suggestions()
+            elif view == "💼 Job Matching":
+                display_jd_tab()
             
-            with tab4:
+            elif view == "📊 Before/After":
                 # Display before/after comparison
                 display_cv_before_after_comparison()
             
-            with tab5:
+            else:
                 # Display enhanced CV
                 if result.get("enhanced_cv"):
                     display_enhanced_cv(result["enhanced_cv"])
@@ -3,13 +3,9 @@ Integration tests for the main application.
 """
 
 import pytest
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from cv_agent.workflow import CVImprovementAgent
+from cv_agent.workflow import CVImprovementAgent, MODEL_NAME
 
 
 class TestMainIntegration:
@@ -93,7 +89,7 @@ class TestMainIntegration:
         assert call_args["original_cv"] == sample_cv_text
         assert call_args["target_role"] == "Software Engineer"
         assert call_args["target_industry"] == "technology"
-        assert call_args["model_used"] == "gpt-4o"
+        assert call_args["model_used"] == MODEL_NAME
         
         # Verify the result
         assert result == mock_result
@@ -1,12 +1,36 @@
 import pytest
-from pathlib import Path
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
 
 from cv_agent.models.state import CVSection, AnalysisScore, Improvement, CVState
 
 
+# Pure pydantic construction tests; no I/O, safe to run in the fast tier
+pytestmark = pytest.mark.unit
+
+
+_STATE_DEFAULTS = dict(
+    original_cv="CV content",
+    file_format="txt",
+    target_role=None,
+    target_industry=None,
+    parsed_sections={},
+    raw_text="CV content",
+    analysis_scores=None,
+    identified_gaps=[],
+    suggested_improvements=[],
+    applied_improvements=[],
+    enhanced_cv=None,
+    enhancement_summary=None,
+    processing_errors=[],
+    processing_time=None,
+    model_used=None
+)
+
+
+def make_state(**overrides) -> CVState:
+    """Build a CVState from shared defaults; override list fields rather than mutating them."""
+    return CVState(**{**_STATE_DEFAULTS, **overrides})
+
+
 class TestCVSection:
     """Test the CVSection model."""
 
@@ -96,12 +120,12 @@ class TestAnalysisScore:
             content_quality=0.75
         )
         
-        assert isinstance(score.overall_score, float)
+        # A validated round-trip covers every field; the float checks guard against silent coercion
+        assert AnalysisScore.model_validate(score.model_dump()) == score
         assert isinstance(score.section_scores, dict)
-        assert isinstance(score.ats_compatibility, float)
-        assert isinstance(score.keyword_density, float)
-        assert isinstance(score.formatting_score, float)
-        assert isinstance(score.content_quality, float)
+        assert all(isinstance(getattr(score, field), float) for field in (
+            "overall_score", "ats_compatibility", "keyword_density", "formatting_score", "content_quality"
+        ))
 
     def test_analysis_score_serialization(self):
         """Test AnalysisScore serialization."""
@@ -143,11 +167,12 @@ class TestImprovement:
         assert improvement.priority == "high"
         assert improvement.confidence == 0.9
 
-    def test_improvement_types(self):
+    @pytest.mark.parametrize("improvement_type", ["content", "format", "keyword", "structure"])
+    def test_improvement_types(self, improvement_type):
         """Test different improvement types."""
-        content_improvement = Improvement(
+        improvement = Improvement(
             section="skills",
-            type="content",
+            type=improvement_type,
             original_text="Python",
             improved_text="Python, Django, Flask",
             reasoning="Added specific frameworks",
@@ -155,54 +180,22 @@ class TestImprovement:
             confidence=0.8
         )
         
-        format_improvement = Improvement(
-            section="experience",
-            type="format",
-            original_text="Developer 2020-2022",
-            improved_text="• Software Developer (2020-2022)",
-            reasoning="Added bullet point formatting",
-            priority="low",
-            confidence=0.7
-        )
-        
-        assert content_improvement.type == "content"
-        assert format_improvement.type == "format"
+        assert improvement.type == improvement_type
 
-    def test_improvement_priorities(self):
+    @pytest.mark.parametrize("priority", ["high", "medium", "low"])
+    def test_improvement_priorities(self, priority):
         """Test improvement priority levels."""
-        high_priority = Improvement(
+        improvement = Improvement(
             section="summary",
             type="content",
             original_text="Developer",
             improved_text="Senior Software Developer",
             reasoning="Added seniority level",
-            priority="high",
+            priority=priority,
             confidence=0.9
         )
         
-        medium_priority = Improvement(
-            section="skills",
-            type="keyword",
-            original_text="Programming",
-            improved_text="Python Programming",
-            reasoning="Added specific language",
-            priority="medium",
-            confidence=0.7
-        )
-        
-        low_priority = Improvement(
-            section="education",
-            type="structure",
-            original_text="CS Degree",
-            improved_text="Bachelor of Computer Science",
-            reasoning="Full degree name",
-            priority="low",
-            confidence=0.6
-        )
-        
-        assert high_priority.priority == "high"
-        assert medium_priority.priority == "medium"
-        assert low_priority.priority == "low"
+        assert improvement.priority == priority
 
     def test_improvement_serialization(self):
         """Test Improvement serialization."""
@@ -265,23 +258,7 @@ class TestCVState:
             confidence=0.9
         )
         
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={"experience": section},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
+        state = make_state(parsed_sections={"experience": section})
         
         assert "experience" in state["parsed_sections"]
         assert state["parsed_sections"]["experience"] == section
@@ -297,23 +274,7 @@ class TestCVState:
             content_quality=0.85
         )
         
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=analysis,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
+        state = make_state(analysis_scores=analysis)
         
         assert state["analysis_scores"] == analysis
         assert state["analysis_scores"].overall_score == 0.8
@@ -330,20 +291,9 @@ class TestCVState:
             confidence=0.8
         )
         
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
+        state = make_state(
             identified_gaps=["Missing contact info"],
             suggested_improvements=[improvement],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
             processing_time=1.5,
             model_used="gpt-4o"
         )
@@ -355,23 +305,8 @@ class TestCVState:
 
     def test_cv_state_optional_fields(self):
         """Test CVState with optional fields."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,  # Optional
-            target_industry=None,  # Optional
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,  # Optional
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,  # Optional
-            enhancement_summary=None,  # Optional
-            processing_errors=[],
-            processing_time=None,  # Optional
-            model_used=None  # Optional
-        )
+        # The defaults leave every optional field unset
+        state = make_state()
         
         assert state["target_role"] is None
         assert state["target_industry"] is None
@@ -384,21 +319,11 @@ class TestCVState:
     def test_cv_state_complete_workflow(self):
         """Test CVState representing a complete workflow."""
         # Initial state
-        state = CVState(
+        state = make_state(
             original_cv="John Doe CV",
-            file_format="txt",
             target_role="Software Engineer",
             target_industry="technology",
-            parsed_sections={},
             raw_text="",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
             model_used="gpt-4o"
         )
         
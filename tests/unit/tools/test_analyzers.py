@@ -1,19 +1,22 @@
 import pytest
-from pathlib import Path
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
 
 from cv_agent.tools.analyzers import CVAnalyzer
 from cv_agent.models.state import CVSection, AnalysisScore
 
 
+@pytest.fixture(scope="module")
+def analyzer():
+    """One analyzer for the whole module; it holds no per-call state."""
+    return CVAnalyzer()
+
+
 class TestCVAnalyzer:
     """Test the CVAnalyzer class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.analyzer = CVAnalyzer()
+    @pytest.fixture(autouse=True)
+    def setup_analyzer(self, analyzer):
+        """Bind the shared analyzer and fresh sample sections to each test."""
+        self.analyzer = analyzer
         
         # Sample CV sections for testing
         self.sample_sections = {
@@ -62,39 +65,32 @@ class TestCVAnalyzer:
         assert isinstance(scores, dict)
         assert len(scores) == len(self.sample_sections)
         
-        for section_name, score in scores.items():
-            assert 0 <= score <= 1
-            assert isinstance(score, float)
+        assert all(isinstance(score, float) and 0.0 <= score <= 1.0 for score in scores.values())
         
         # Experience section should have reasonable score due to action verbs and quantified achievements
         assert scores['experience'] > 0.3
 
-    def test_analyze_content_quality_summary_section(self):
-        """Test content quality analysis for summary section specifically."""
-        summary_section = {
-            'summary': CVSection(
-                name='summary',
-                content='Achieved 95% customer satisfaction. Developed innovative solutions. Managed team of 10+.',
-                position=0,
-                confidence=0.9
-            )
-        }
-        
-        scores = self.analyzer.analyze_content_quality(summary_section)
-        assert scores['summary'] > 0.3  # Should score reasonably due to action verbs and numbers
-
-    def test_analyze_content_quality_empty_content(self):
-        """Test content quality analysis with empty content."""
-        empty_section = {
-            'empty': CVSection(
-                name='empty',
-                content='',
-                position=0,
-                confidence=0.5
-            )
-        }
-        
-        scores = self.analyzer.analyze_content_quality(empty_section)
+    @pytest.mark.parametrize("section_name,content,minimum", [
+        # Action verbs and numbers in a summary
+        ('summary', 'Achieved 95% customer satisfaction. Developed innovative solutions. Managed team of 10+.', 0.3),
+        # Many action verbs
+        ('experience', 'Achieved goals. Developed software. Managed teams. Led projects. Created solutions. Implemented features.', 0.3),
+        # Quantified achievements
+        ('experience', 'Increased revenue by 25%. Managed $2M budget. Led team of 15+ developers. Improved performance by 3x.', 0.5),
+    ])
+    def test_analyze_content_quality_single_section(self, section_name, content, minimum):
+        """Test that action verbs and quantified achievements raise a section's score."""
+        section = {section_name: CVSection(name=section_name, content=content, position=0, confidence=0.9)}
+        
+        scores = self.analyzer.analyze_content_quality(section)
+        assert scores[section_name] > minimum
+
+    @pytest.mark.parametrize("content", ['', '  \n\t '])
+    def test_analyze_content_quality_blank_content(self, content):
+        """Test that empty or whitespace-only content scores zero."""
+        section = {'empty': CVSection(name='empty', content=content, position=0, confidence=0.5)}
+        
+        scores = self.analyzer.analyze_content_quality(section)
         assert scores['empty'] == 0.0
 
     def test_check_ats_compatibility(self):
@@ -143,6 +139,18 @@ Python, JavaScript, React
         assert 0 <= density <= 1
         assert density > 0.1  # Should find some tech keywords
 
+    @pytest.mark.parametrize("content,expected_keywords", [
+        ("Maintained legacy billing systems", 0),  # 'ai' inside 'maintained' is not a keyword
+        ("Built REST APIs", 1),  # Plurals still count
+        ("JavaScript and Java", 2),  # 'java' is not counted inside 'javascript'
+        ("Machine learning with Python", 2),
+    ])
+    def test_calculate_keyword_density_whole_words(self, content, expected_keywords):
+        """Test that industry keywords match as whole words, allowing plurals."""
+        density = self.analyzer.calculate_keyword_density(content, "technology")
+        
+        assert density == expected_keywords / len(self.analyzer.industry_keywords["technology"])
+
     def test_calculate_keyword_density_no_industry(self):
         """Test keyword density calculation with no industry specified."""
         content = "Generic content"
@@ -310,42 +318,10 @@ Computer Science (2019)
         assert 'budgeting' in finance_keywords
 
     def test_ats_patterns_validity(self):
-        """Test that ATS patterns are valid regex patterns."""
+        """Test that ATS patterns are precompiled regex patterns."""
         import re
         
-        for pattern_name, pattern in self.analyzer.ats_patterns.items():
-            try:
-                re.compile(pattern)
-            except re.error:
-                pytest.fail(f"Invalid regex pattern for {pattern_name}: {pattern}")
-
-    def test_action_verbs_detection(self):
-        """Test that action verbs are properly detected in content quality analysis."""
-        action_heavy_section = {
-            'experience': CVSection(
-                name='experience',
-                content='Achieved goals. Developed software. Managed teams. Led projects. Created solutions. Implemented features.',
-                position=0,
-                confidence=0.9
-            )
-        }
-        
-        scores = self.analyzer.analyze_content_quality(action_heavy_section)
-        assert scores['experience'] > 0.3  # Should score reasonably due to many action verbs
-
-    def test_quantified_achievements_detection(self):
-        """Test that quantified achievements are properly detected."""
-        quantified_section = {
-            'experience': CVSection(
-                name='experience',
-                content='Increased revenue by 25%. Managed $2M budget. Led team of 15+ developers. Improved performance by 3x.',
-                position=0,
-                confidence=0.9
-            )
-        }
-        
-        scores = self.analyzer.analyze_content_quality(quantified_section)
-        assert scores['experience'] > 0.5  # Should score well due to quantified achievements
+        assert all(isinstance(pattern, re.Pattern) for pattern in self.analyzer.ats_patterns.values())
 
 
 if __name__ == "__main__":
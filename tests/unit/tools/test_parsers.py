@@ -1,11 +1,6 @@
 import pytest
-import tempfile
-import os
-from pathlib import Path
-from unittest.mock import patch, MagicMock
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, mock_open
 
 from cv_agent.tools.parsers import (
     DocumentParser,
@@ -19,6 +14,13 @@ from cv_agent.tools.parsers import (
 from cv_agent.models.state import CVSection
 
 
+@pytest.fixture(scope="module")
+def docling_parser():
+    """One DoclingParser over a mocked converter; tests swap in their own converter via monkeypatch."""
+    with patch('cv_agent.tools.parsers.DocumentConverter'):
+        return DoclingParser()
+
+
 class TestDocumentParser:
     """Test the base DocumentParser class."""
 
@@ -50,30 +52,22 @@ Python, JavaScript
         assert isinstance(sections, dict)
         assert len(sections) > 0
         
-        # Check that sections contain CVSection objects
-        for section_name, section in sections.items():
-            assert isinstance(section, CVSection)
-            assert section.name == section_name
-            assert isinstance(section.content, str)
-            assert isinstance(section.position, int)
-            assert isinstance(section.confidence, float)
+        # Check that sections contain CVSection objects keyed by name; pydantic validates the field types
+        assert all(isinstance(section, CVSection) and section.name == section_name
+                   for section_name, section in sections.items())
 
 
 class TestTextParser:
     """Test the TextParser class."""
 
-    def test_parse_text_file(self):
+    def test_parse_text_file(self, tmp_path):
         """Test parsing a text file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("Test content\nSecond line")
-            temp_path = f.name
+        cv_file = tmp_path / "cv.txt"
+        cv_file.write_text("Test content\nSecond line")
 
-        try:
-            parser = TextParser()
-            result = parser.parse(temp_path)
-            assert result == "Test content\nSecond line"
-        finally:
-            os.unlink(temp_path)
+        parser = TextParser()
+        result = parser.parse(str(cv_file))
+        assert result == "Test content\nSecond line"
 
     def test_parse_nonexistent_file(self):
         """Test parsing a non-existent file raises ValueError."""
@@ -81,16 +75,17 @@ class TestTextParser:
         with pytest.raises(ValueError, match="Error parsing text file"):
             parser.parse("nonexistent.txt")
 
-    def test_extract_sections_with_cv_content(self):
+    def test_parse_bytes(self):
+        """Test parsing in-memory text content."""
+        parser = TextParser()
+        result = parser.parse_bytes(b"Test content\nSecond line\n")
+        assert result == "Test content\nSecond line"
+
+    def test_extract_sections_with_cv_content(self, fixture_cv_text):
         """Test section extraction with CV-like content."""
         parser = TextParser()
         
-        # Load sample CV content
-        fixture_path = Path(__file__).parent.parent.parent / "fixtures" / "sample_cv.txt"
-        with open(fixture_path, 'r') as f:
-            cv_content = f.read()
-        
-        sections = parser.extract_sections(cv_content)
+        sections = parser.extract_sections(fixture_cv_text)
         
         # Check that common CV sections are detected
         expected_sections = ['summary', 'experience', 'education', 'skills']
@@ -106,22 +101,14 @@ class TestPDFParser:
     @patch('cv_agent.tools.parsers.PyPDF2.PdfReader')
     def test_parse_pdf_success(self, mock_pdf_reader):
         """Test successful PDF parsing."""
-        # Mock PDF reader
-        mock_page = MagicMock()
-        mock_page.extract_text.return_value = "PDF content"
-        mock_reader_instance = MagicMock()
-        mock_reader_instance.pages = [mock_page]
-        mock_pdf_reader.return_value = mock_reader_instance
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-            temp_path = f.name
+        # Plain stub reader; only the patched class needs to be a mock
+        mock_pdf_reader.return_value = SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda: "PDF content")])
 
-        try:
+        # The reader is mocked, so the file handle is never read
+        with patch('builtins.open', mock_open(read_data=b"")):
             parser = PDFParser()
-            result = parser.parse(temp_path)
-            assert result == "PDF content"
-        finally:
-            os.unlink(temp_path)
+            result = parser.parse("cv.pdf")
+        assert result == "PDF content"
 
     def test_parse_pdf_error(self):
         """Test PDF parsing with error."""
@@ -136,22 +123,12 @@ class TestDocxParser:
     @patch('cv_agent.tools.parsers.Document')
     def test_parse_docx_success(self, mock_document):
         """Test successful DOCX parsing."""
-        # Mock Document
-        mock_paragraph = MagicMock()
-        mock_paragraph.text = "DOCX content"
-        mock_doc_instance = MagicMock()
-        mock_doc_instance.paragraphs = [mock_paragraph]
-        mock_document.return_value = mock_doc_instance
-
-        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
-            temp_path = f.name
-
-        try:
-            parser = DocxParser()
-            result = parser.parse(temp_path)
-            assert result == "DOCX content"
-        finally:
-            os.unlink(temp_path)
+        mock_document.return_value = SimpleNamespace(paragraphs=[SimpleNamespace(text="DOCX content")])
+
+        # Document is mocked and receives the path directly; no file is needed
+        parser = DocxParser()
+        result = parser.parse("cv.docx")
+        assert result == "DOCX content"
 
     def test_parse_docx_error(self):
         """Test DOCX parsing with error."""
@@ -170,43 +147,30 @@ class TestDoclingParser:
         assert hasattr(parser, 'converter')
         mock_converter.assert_called_once()
 
-    @patch('cv_agent.tools.parsers.DocumentConverter')
-    def test_parse_docling_success(self, mock_converter):
+    def test_parse_docling_success(self, docling_parser, monkeypatch):
         """Test successful Docling parsing."""
-        # Mock converter and result
-        mock_document = MagicMock()
-        mock_document.export_to_markdown.return_value = "# Markdown content"
-        mock_result = MagicMock()
-        mock_result.document = mock_document
-        mock_converter_instance = MagicMock()
-        mock_converter_instance.convert.return_value = mock_result
-        mock_converter.return_value = mock_converter_instance
+        # Stub converter whose result exports fixed markdown
+        result = SimpleNamespace(document=SimpleNamespace(export_to_markdown=lambda: "# Markdown content"))
+        monkeypatch.setattr(docling_parser, "converter", SimpleNamespace(convert=lambda source: result))
 
-        parser = DoclingParser()
-        result = parser.parse("test.pdf")
+        result = docling_parser.parse("test.pdf")
         assert result == "# Markdown content"
 
-    @patch('cv_agent.tools.parsers.DocumentConverter')
-    def test_parse_docling_error(self, mock_converter):
+    def test_parse_docling_error(self, docling_parser, monkeypatch):
         """Test Docling parsing with error."""
-        mock_converter_instance = MagicMock()
-        mock_converter_instance.convert.side_effect = Exception("Docling error")
-        mock_converter.return_value = mock_converter_instance
+        converter = MagicMock()
+        converter.convert.side_effect = Exception("Docling error")
+        monkeypatch.setattr(docling_parser, "converter", converter)
 
-        parser = DoclingParser()
         with pytest.raises(ValueError, match="Error parsing document with Docling"):
-            parser.parse("test.pdf")
+            docling_parser.parse("test.pdf")
 
-    def test_extract_sections_markdown(self):
+    @pytest.mark.docling
+    def test_extract_sections_markdown(self, fixture_cv_markdown):
         """Test section extraction with markdown content."""
         parser = DoclingParser()
         
-        # Load sample markdown CV content
-        fixture_path = Path(__file__).parent.parent.parent / "fixtures" / "sample_cv_markdown.md"
-        with open(fixture_path, 'r') as f:
-            markdown_content = f.read()
-        
-        sections = parser.extract_sections(markdown_content)
+        sections = parser.extract_sections(fixture_cv_markdown)
         
         # Check that markdown sections are detected
         expected_sections = ['contact', 'summary', 'experience', 'education', 'skills']
@@ -273,47 +237,46 @@ Experienced developer
 class TestParserFactory:
     """Test the ParserFactory class."""
 
-    def test_create_text_parser(self):
-        """Test creating a text parser."""
-        parser = ParserFactory.create_parser("test.txt", use_docling=False)
-        assert isinstance(parser, TextParser)
-
-    def test_create_pdf_parser_traditional(self):
-        """Test creating a traditional PDF parser."""
-        parser = ParserFactory.create_parser("test.pdf", use_docling=False)
-        assert isinstance(parser, PDFParser)
-
-    def test_create_docx_parser_traditional(self):
-        """Test creating a traditional DOCX parser."""
-        parser = ParserFactory.create_parser("test.docx", use_docling=False)
-        assert isinstance(parser, DocxParser)
-
+    @pytest.mark.parametrize("file_path,expected", [
+        ("test.txt", TextParser),
+        ("test.pdf", PDFParser),
+        ("test.docx", DocxParser),
+    ])
+    def test_create_traditional_parser(self, file_path, expected):
+        """Test creating traditional parsers with Docling disabled."""
+        parser = ParserFactory.create_parser(file_path, use_docling=False)
+        assert isinstance(parser, expected)
+
+    @pytest.mark.parametrize("file_path,kwargs", [
+        ("test.pdf", {"use_docling": True}),
+        ("test.docx", {"use_docling": True}),
+        ("test.pdf", {}),  # use_docling defaults to True
+    ])
+    @patch('cv_agent.tools.parsers.DOCLING_AVAILABLE', True)
     @patch('cv_agent.tools.parsers.DoclingParser')
-    def test_create_docling_parser_pdf(self, mock_docling):
-        """Test creating a Docling parser for PDF."""
-        mock_docling.return_value = MagicMock()
-        parser = ParserFactory.create_parser("test.pdf", use_docling=True)
+    def test_create_docling_parser(self, mock_docling, file_path, kwargs):
+        """Test that Docling is used for supported formats when enabled or by default."""
+        ParserFactory.create_parser(file_path, **kwargs)
         mock_docling.assert_called_once_with(use_llm=True)
 
+    @pytest.mark.parametrize("file_path,expected", [
+        ("test.pdf", PDFParser),
+        ("test.docx", DocxParser),
+    ])
+    @patch('cv_agent.tools.parsers.DOCLING_AVAILABLE', False)
     @patch('cv_agent.tools.parsers.DoclingParser')
-    def test_create_docling_parser_docx(self, mock_docling):
-        """Test creating a Docling parser for DOCX."""
-        mock_docling.return_value = MagicMock()
-        parser = ParserFactory.create_parser("test.docx", use_docling=True)
-        mock_docling.assert_called_once_with(use_llm=True)
+    def test_create_parser_without_docling(self, mock_docling, file_path, expected):
+        """Test that traditional parsers are returned when Docling is not installed."""
+        parser = ParserFactory.create_parser(file_path, use_docling=True)
+
+        assert isinstance(parser, expected)
+        mock_docling.assert_not_called()
 
     def test_create_parser_unsupported_format(self):
         """Test creating parser for unsupported format."""
         with pytest.raises(ValueError, match="Unsupported file format"):
             ParserFactory.create_parser("test.xyz")
 
-    def test_create_parser_default_docling(self):
-        """Test that Docling is used by default for supported formats."""
-        with patch('cv_agent.tools.parsers.DoclingParser') as mock_docling:
-            mock_docling.return_value = MagicMock()
-            parser = ParserFactory.create_parser("test.pdf")  # use_docling defaults to True
-            mock_docling.assert_called_once_with(use_llm=True)
-
     def test_create_llm_parser(self):
         """Test creating a pure LLM parser."""
         parser = ParserFactory.create_llm_parser()
@@ -0,0 +1,120 @@
+import pytest
+
+from cv_agent.tools.user_interaction import (
+    MAX_CONTEXT_CHARS, MAX_RESPONSE_CHARS, UserInteractionManager,
+    _content_lacks_metrics, _is_weak_experience_content
+)
+
+
+# Filler without any weak or strong phrase, to lift experience content past the 200-char minimum
+FILLER = " Python services for payments and reporting." * 5
+
+
+@pytest.fixture(scope="module")
+def manager():
+    """One manager for the whole module; no LLM is created unless a test asks for it."""
+    return UserInteractionManager()
+
+
+def experience(content):
+    """Parsed sections holding only an experience section with the given content."""
+    return {"experience": {"name": "experience", "content": content, "position": 0}}
+
+
+@pytest.fixture
+def long_cv_state():
+    """Interaction state for a long CV with many sections and gaps."""
+    return {
+        "target_role": "Software Engineer",
+        "target_industry": "technology",
+        "parsed_sections": {
+            f"section_{index}": {"content": "Python " * 500} for index in range(40)
+        },
+        "analysis_scores": {"overall_score": 0.6},
+        "identified_gaps": ["Missing metrics", "Weak summary", "Few keywords", "Long CV"]
+    }
+
+
+class TestPrepareContext:
+    """Test the length cap on the suggestion prompt context."""
+
+    def test_long_responses_are_trimmed(self, manager, long_cv_state):
+        """Test that long answers are shortened before anything else is dropped."""
+        responses = {f"question_{index}": "detail " * 300 for index in range(10)}
+
+        context = manager._prepare_context(long_cv_state, responses)
+
+        assert len(context) <= MAX_CONTEXT_CHARS
+        assert "Identified Gaps: Missing metrics, Weak summary, Few keywords" in context
+        assert f"- question_0: {('detail ' * 300)[:MAX_RESPONSE_CHARS]}..." in context
+
+    def test_context_is_capped_and_keeps_headers(self, manager, long_cv_state):
+        """Test that a context still too long is cut to MAX_CONTEXT_CHARS with its header lines intact."""
+        responses = {f"question_{index}": "detail " * 300 for index in range(40)}
+
+        context = manager._prepare_context(long_cv_state, responses)
+
+        assert len(context) == MAX_CONTEXT_CHARS
+        lines = context.split("\n")
+        assert lines[:2] == ["Target Role: Software Engineer", "Target Industry: technology"]
+        assert lines[2].startswith("CV has 40 sections: ['section_0'")
+        assert "'section_10'" not in lines[2]  # The section list is shortened before the final cut
+        assert "Overall CV Score: 0.6" in context
+        assert "User Responses:" in context
+
+
+class TestWeakExperienceDescriptions:
+    """Test the weak/strong verdict on experience descriptions."""
+
+    @pytest.mark.parametrize("content,expected", [
+        ("Worked on various projects. Responsible for daily tasks." + FILLER, True),
+        ("Led the platform team and built the billing service." + FILLER, False),
+        # Each distinct phrase counts once, however often it is repeated
+        ("Worked on APIs. Worked on jobs. Worked on UIs. Led and built releases." + FILLER, False),
+        ("Assisted with releases. Helped with support. Led one migration." + FILLER, True),
+        ("Led and built it.", True),  # Too short regardless of phrasing
+    ])
+    def test_verdict(self, manager, content, expected):
+        """Test that content is weak when distinct weak phrases outnumber strong ones or it is short."""
+        assert manager._has_weak_experience_descriptions(experience(content)) is expected
+
+    def test_phrases_match_case_insensitively(self, manager):
+        """Test that phrase matching ignores case."""
+        content = "LED THE TEAM AND BUILT THE PLATFORM." + FILLER
+
+        assert manager._has_weak_experience_descriptions(experience(content)) is False
+
+    def test_missing_experience_is_weak(self, manager):
+        """Test that a CV without an experience section counts as weak."""
+        assert manager._has_weak_experience_descriptions({}) is True
+
+
+class TestCachedVerdicts:
+    """Test the content-keyed verdict caches."""
+
+    @pytest.mark.parametrize("content,expected", [
+        ("Improved response times by 40%", False),
+        ("Managed a budget of $50000", False),
+        ("Managed a team of 5 people", False),
+        ("Wrote code and fixed bugs", True),
+    ])
+    def test_lacks_quantifiable_metrics(self, manager, content, expected):
+        """Test that CVs without numbers, percentages or amounts lack metrics."""
+        sections = {"experience": {"content": content}}
+
+        assert manager._lacks_quantifiable_metrics(sections) is expected
+
+    @pytest.mark.parametrize("verdict,content", [
+        (_content_lacks_metrics, "Shipped features for the payments team"),
+        (_is_weak_experience_content, "Worked on various projects." + FILLER),
+    ])
+    def test_repeated_content_is_served_from_cache(self, verdict, content):
+        """Test that the same content returns the same verdict from the cache."""
+        verdict.cache_clear()
+
+        first = verdict(content)
+        second = verdict(content)
+
+        assert first == second
+        info = verdict.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
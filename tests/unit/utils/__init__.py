@@ -0,0 +1 @@
+# Utils tests package
\ No newline at end of file
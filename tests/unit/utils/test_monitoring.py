@@ -0,0 +1,261 @@
+import hashlib
+import logging
+import queue
+import threading
+from unittest.mock import Mock
+
+import pytest
+from langsmith.utils import LangSmithConnectionError
+
+import cv_agent.utils.monitoring as monitoring
+from cv_agent.utils.monitoring import (
+    LangSmithMonitor, TraceBuffer, _RateLimitFilter, _mask_cv, trace_cv_node, tracing_enabled
+)
+
+
+def make_record(message):
+    """Build a warning log record carrying the given message."""
+    return logging.LogRecord("cv_agent.monitoring", logging.WARNING, __file__, 0, message, None, None)
+
+
+@pytest.fixture
+def monitor(monkeypatch, tmp_path):
+    """An enabled monitor with a mocked LangSmith client; no feedback worker is started."""
+    monkeypatch.delenv("LANGSMITH_API_KEY", raising=False)
+    monkeypatch.setattr(monitoring, "FEEDBACK_RETRY_BACKOFF_SECONDS", 0)
+    monitor = LangSmithMonitor(buffer_path=str(tmp_path / "buffer.jsonl"))
+    monitor.enabled = True
+    monitor.client = Mock(spec=["create_feedback"])
+    return monitor
+
+
+class TestTraceBuffer:
+    """Test the append-only buffer for undelivered events."""
+
+    def test_retry_delivers_buffered_events(self, tmp_path):
+        """Test that buffered events are replayed in order and the file is removed."""
+        buffer = TraceBuffer(str(tmp_path / "buffer.jsonl"))
+        buffer.append({"run_id": "1"})
+        buffer.append({"run_id": "2"})
+
+        sent = []
+        assert buffer.retry(sent.append) == 2
+        assert sent == [{"run_id": "1"}, {"run_id": "2"}]
+        assert not buffer.path.exists()
+
+    def test_retry_keeps_events_after_a_failure(self, tmp_path):
+        """Test that replay stops at the first failure and keeps the undelivered events."""
+        buffer = TraceBuffer(str(tmp_path / "buffer.jsonl"))
+        for run_id in ("1", "2", "3"):
+            buffer.append({"run_id": run_id})
+
+        def send(event):
+            if event["run_id"] == "2":
+                raise LangSmithConnectionError("still down")
+
+        assert buffer.retry(send) == 1
+        assert buffer.retry(lambda event: None) == 2
+        assert not buffer.path.exists()
+
+    def test_retry_drops_rejected_events(self, tmp_path):
+        """Test that an event failing for a reason other than the connection is dropped, not retried forever."""
+        buffer = TraceBuffer(str(tmp_path / "buffer.jsonl"))
+        for run_id in ("1", "bad", "3"):
+            buffer.append({"run_id": run_id})
+
+        sent = []
+        def send(event):
+            if event["run_id"] == "bad":
+                raise ValueError("invalid run id")
+            sent.append(event)
+
+        assert buffer.retry(send) == 2
+        assert sent == [{"run_id": "1"}, {"run_id": "3"}]
+        assert not buffer.path.exists()
+
+    def test_append_during_retry_is_kept(self, tmp_path):
+        """Test that appends don't wait for a replay in progress and survive its rewrite."""
+        buffer = TraceBuffer(str(tmp_path / "buffer.jsonl"))
+        buffer.append({"run_id": "1"})
+        buffer.append({"run_id": "2"})
+
+        def send(event):
+            # Appending here would deadlock if retry held the file lock while sending
+            buffer.append({"run_id": f"new-{event['run_id']}"})
+            if event["run_id"] == "2":
+                raise LangSmithConnectionError("down")
+
+        assert buffer.retry(send) == 1
+
+        remaining = []
+        assert buffer.retry(remaining.append) == 3
+        assert remaining == [{"run_id": "2"}, {"run_id": "new-1"}, {"run_id": "new-2"}]
+
+    def test_retry_without_buffer_file(self, tmp_path):
+        """Test that replaying an empty buffer sends nothing."""
+        send = Mock()
+        assert TraceBuffer(str(tmp_path / "buffer.jsonl")).retry(send) == 0
+        send.assert_not_called()
+
+
+class TestRateLimitFilter:
+    """Test the duplicate-warning filter."""
+
+    def test_repeated_message_is_dropped(self):
+        """Test that a message is logged once per window while other messages pass."""
+        log_filter = _RateLimitFilter(window_seconds=60)
+
+        assert log_filter.filter(make_record("LangSmith down"))
+        assert not log_filter.filter(make_record("LangSmith down"))
+        assert log_filter.filter(make_record("Other failure"))
+
+    def test_message_is_logged_again_after_window(self):
+        """Test that a message passes again once its window has elapsed."""
+        log_filter = _RateLimitFilter(window_seconds=0)
+
+        assert log_filter.filter(make_record("LangSmith down"))
+        assert log_filter.filter(make_record("LangSmith down"))
+
+
+class TestFeedback:
+    """Test background feedback delivery."""
+
+    def test_log_user_feedback_disabled(self, monitor):
+        """Test that feedback is dropped when monitoring is disabled."""
+        monitor.enabled = False
+        monitor.log_user_feedback("run-1", {"satisfaction_score": 1})
+
+        assert monitor._feedback_queue.empty()
+
+    def test_feedback_worker_sends_queued_feedback(self, monitor):
+        """Test that the worker sends queued feedback and flush_feedback waits for it."""
+        threading.Thread(target=monitor._process_feedback_queue, daemon=True).start()
+
+        monitor.log_user_feedback("run-1", {"satisfaction_score": 4, "comment": "Helpful"})
+
+        assert monitor.flush_feedback(timeout=5)
+        monitor.client.create_feedback.assert_called_once_with(
+            run_id="run-1", key="user_satisfaction", score=4, comment="Helpful"
+        )
+
+    def test_flush_feedback_times_out(self, monitor):
+        """Test that flush_feedback gives up when nothing drains the queue."""
+        monitor.log_user_feedback("run-1", {"satisfaction_score": 4})
+
+        assert not monitor.flush_feedback(timeout=0.01)
+
+    def test_send_feedback_buffers_after_retries(self, monitor):
+        """Test that connection errors are retried and then buffered for replay."""
+        monitor.client.create_feedback.side_effect = LangSmithConnectionError("down")
+
+        monitor._send_feedback("run-1", {"satisfaction_score": 2})
+
+        assert monitor.client.create_feedback.call_count == monitoring.FEEDBACK_MAX_RETRIES
+
+        # Once LangSmith is reachable again the buffered feedback is delivered
+        monitor.client.create_feedback.side_effect = None
+        monitor.client.create_feedback.reset_mock()
+        assert monitor._trace_buffer.retry(
+            lambda event: monitor._create_feedback(event["run_id"], event["feedback"])
+        ) == 1
+        monitor.client.create_feedback.assert_called_once_with(
+            run_id="run-1", key="user_satisfaction", score=2, comment=""
+        )
+
+    def test_full_queue_spills_to_buffer(self, monitor):
+        """Test that feedback beyond the queue bound is buffered rather than dropped or blocking."""
+        monitor._feedback_queue = queue.Queue(maxsize=1)
+
+        monitor.log_user_feedback("run-1", {"satisfaction_score": 1})
+        monitor.log_user_feedback("run-2", {"satisfaction_score": 2})
+
+        assert monitor._feedback_queue.qsize() == 1
+        sent = []
+        assert monitor._trace_buffer.retry(sent.append) == 1
+        assert sent == [{"run_id": "run-2", "feedback": {"satisfaction_score": 2}}]
+
+    def test_feedback_queue_is_bounded(self, monitor):
+        """Test that the feedback queue is created with FEEDBACK_QUEUE_MAX_SIZE."""
+        assert monitor._feedback_queue.maxsize == monitoring.FEEDBACK_QUEUE_MAX_SIZE
+
+
+class TestTracing:
+    """Test CV masking and the tracing gate."""
+
+    def test_mask_cv_summarizes_cv_text(self):
+        """Test that full CV text and uploaded bytes are replaced by a summary wherever they are nested."""
+        cv_text = "John Doe " * 100
+        upload = b"%PDF-1.7" + bytes(4096)
+        masked = _mask_cv({
+            "state": {"raw_text": cv_text, "raw_bytes": upload, "target_role": "Engineer"},
+            "history": [{"enhanced_cv": cv_text}]
+        })
+
+        summary = masked["state"]["raw_text"]
+        assert summary["length"] == len(cv_text)
+        assert summary["preview"] == cv_text[:monitoring.TRACE_PREVIEW_CHARS]
+        assert len(summary["sha256"]) == 12
+        assert masked["history"][0]["enhanced_cv"] == summary
+        assert masked["state"]["target_role"] == "Engineer"
+
+        # Binary uploads get only a length and hash, no preview
+        assert masked["state"]["raw_bytes"] == {
+            "length": len(upload),
+            "sha256": hashlib.sha256(upload).hexdigest()[:12]
+        }
+
+    @pytest.mark.parametrize("tracing,api_key,expected", [
+        ("true", "key", True),
+        ("false", "key", False),
+        ("true", "", False),
+    ])
+    def test_tracing_enabled(self, monkeypatch, tracing, api_key, expected):
+        """Test that tracing needs both LANGSMITH_TRACING=true and an API key."""
+        monkeypatch.setenv("LANGSMITH_TRACING", tracing)
+        monkeypatch.setenv("LANGSMITH_API_KEY", api_key)
+
+        assert tracing_enabled() is expected
+
+    def test_trace_cv_node_gate_off(self, monkeypatch):
+        """Test that nodes are left unwrapped and untraced when tracing is off."""
+        monkeypatch.delenv("LANGSMITH_TRACING", raising=False)
+        traceable = Mock()
+        monkeypatch.setattr(monitoring, "traceable", traceable)
+
+        def node(state):
+            return {}
+
+        assert trace_cv_node("parse")(node) is node
+        traceable.assert_not_called()
+
+    def test_trace_cv_node_masks_traced_inputs(self, monkeypatch):
+        """Test that traced node inputs and outputs go through the CV mask."""
+        monkeypatch.setenv("LANGSMITH_TRACING", "true")
+        monkeypatch.setenv("LANGSMITH_API_KEY", "key")
+        traceable = Mock(return_value=lambda func: func)
+        monkeypatch.setattr(monitoring, "traceable", traceable)
+
+        traced = trace_cv_node("parse")(lambda state: {"raw_text": state["raw_text"]})
+        result = traced({"raw_text": "John Doe CV"})
+
+        options = traceable.call_args.kwargs
+        assert options["process_inputs"] is _mask_cv
+        assert options["process_outputs"] is _mask_cv
+        assert options["process_inputs"]({"raw_text": "John Doe CV"})["raw_text"]["length"] == 11
+        # The node itself still sees and returns the full text
+        assert result["raw_text"] == "John Doe CV"
+
+    def test_trace_cv_processing_disabled(self, monitor):
+        """Test that nothing is traced when monitoring is disabled."""
+        monitor.enabled = False
+
+        assert monitor.trace_cv_processing("parse_cv", result_summary={"errors": 0}) is None
+
+    def test_summarize_result_is_scalar_only(self):
+        """Test that the traced result summary holds key names and an error count, not CV text."""
+        summary = LangSmithMonitor.summarize_result({
+            "raw_text": "John Doe CV",
+            "processing_errors": ["error"]
+        })
+
+        assert summary == {"keys": ["raw_text", "processing_errors"], "errors": 1}
@@ -1,152 +1,117 @@
+import os
 import pytest
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, Mock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+import cv_agent.workflow as workflow_module
+from cv_agent.workflow import CVImprovementAgent, create_cv_improvement_workflow, should_apply_improvements, quality_check_node, normalize_improvements
+from cv_agent.models.state import CVSection, AnalysisScore, Improvement
 
-from cv_agent.workflow import CVImprovementAgent, create_cv_improvement_workflow, should_apply_improvements, quality_check_node
-from cv_agent.models.state import CVState, CVSection, AnalysisScore, Improvement
+
+# Shared, read-only improvement; tests derive variants with model_copy(update=...)
+HIGH_PRIORITY_IMPROVEMENT = Improvement(
+    section="experience",
+    type="content",
+    original_text="Developer",
+    improved_text="Senior Developer",
+    reasoning="Added seniority",
+    priority="high",
+    confidence=0.8
+)
+
+# Every key CVImprovementAgent puts in the initial state handed to app.invoke
+INITIAL_STATE_KEYS = (
+    "original_cv", "raw_bytes", "file_format", "target_role", "target_industry",
+    "parsed_sections", "raw_text", "analysis_scores", "identified_gaps",
+    "suggested_improvements", "applied_improvements", "enhanced_cv",
+    "enhancement_summary", "processing_errors", "processing_time", "model_used"
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_default_agent(monkeypatch):
+    """Start every test without the memoized default agent, so patched workflows are always built."""
+    monkeypatch.setattr(workflow_module, "_default_agent", None)
+
+
+@pytest.fixture(scope="module")
+def workflow():
+    """The uncompiled workflow graph, built once for tests that only inspect it."""
+    return create_cv_improvement_workflow()
+
+
+@pytest.fixture
+def mock_workflow(monkeypatch):
+    """A mocked workflow graph that CVImprovementAgent gets instead of the real one."""
+    mock_workflow = Mock(spec=['compile'])
+    mock_workflow.compile.return_value = Mock(spec=['invoke', 'stream'])
+    monkeypatch.setattr(workflow_module, "create_cv_improvement_workflow", Mock(return_value=mock_workflow))
+    return mock_workflow
+
+
+@pytest.fixture
+def mock_app(mock_workflow):
+    """The mocked compiled app behind every CVImprovementAgent built in the test."""
+    return mock_workflow.compile.return_value
+
+
+@pytest.fixture(scope="module")
+def agent():
+    """
+    One compiled agent for tests that only use its stateless helpers. Tests that
+    call process_cv build their own agent so result caches never leak between tests.
+    """
+    return CVImprovementAgent()
 
 
 class TestWorkflowFunctions:
     """Test individual workflow functions."""
 
-    def test_should_apply_improvements_with_high_priority(self):
-        """Test should_apply_improvements with high priority improvements."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[
-                Improvement(
-                    section="experience",
-                    type="content",
-                    original_text="Developer",
-                    improved_text="Senior Developer",
-                    reasoning="Added seniority",
-                    priority="high",
-                    confidence=0.8
-                )
-            ],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
-        
-        result = should_apply_improvements(state)
-        assert result == "apply_improvements"
-
-    def test_should_apply_improvements_no_high_priority(self):
-        """Test should_apply_improvements without high priority improvements."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[
-                Improvement(
-                    section="skills",
-                    type="content",
-                    original_text="Python",
-                    improved_text="Python, Django",
-                    reasoning="Added framework",
-                    priority="medium",
-                    confidence=0.7
-                )
-            ],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
-        
-        result = should_apply_improvements(state)
-        assert result == "quality_check"
+    @pytest.mark.parametrize("as_dict", [False, True], ids=["model", "dict"])
+    @pytest.mark.parametrize("priority,confidence,expected", [
+        ("high", 0.8, "apply_improvements"),
+        ("medium", 0.7, "quality_check"),  # No high priority
+        ("high", 0.5, "quality_check"),  # High priority but low confidence
+    ])
+    def test_should_apply_improvements(self, base_cv_state, priority, confidence, expected, as_dict):
+        """Test should_apply_improvements routes on high-priority, confident improvements."""
+        improvement = HIGH_PRIORITY_IMPROVEMENT.model_copy(update={"priority": priority, "confidence": confidence})
+        # generate_improvements_node emits model_dump() dicts, so that is the form the graph routes on
+        if as_dict:
+            improvement = improvement.model_dump()
+        state = {**base_cv_state, "suggested_improvements": [improvement]}
+        
+        assert should_apply_improvements(state) == expected
 
-    def test_should_apply_improvements_low_confidence(self):
-        """Test should_apply_improvements with high priority but low confidence."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[
-                Improvement(
-                    section="experience",
-                    type="content",
-                    original_text="Developer",
-                    improved_text="Senior Developer",
-                    reasoning="Added seniority",
-                    priority="high",
-                    confidence=0.5  # Low confidence
-                )
-            ],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
+    def test_should_apply_improvements_mixed_list(self, base_cv_state):
+        """Test should_apply_improvements with dicts and models in the same list."""
+        state = {
+            **base_cv_state,
+            "suggested_improvements": [{"priority": "low"}, HIGH_PRIORITY_IMPROVEMENT]
+        }
         
-        result = should_apply_improvements(state)
-        assert result == "quality_check"
+        assert should_apply_improvements(state) == "apply_improvements"
 
-    def test_should_apply_improvements_empty_list(self):
+    def test_should_apply_improvements_empty_list(self, base_cv_state):
         """Test should_apply_improvements with empty improvements list."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],  # Empty list
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
+        state = {**base_cv_state, "suggested_improvements": []}
         
         result = should_apply_improvements(state)
         assert result == "quality_check"
 
-    def test_quality_check_node_with_enhancements(self):
+    def test_normalize_improvements(self):
+        """Test that Pydantic improvements are converted to dicts and dicts pass through."""
+        existing = {"section": "skills", "priority": "low"}
+        
+        result = normalize_improvements([HIGH_PRIORITY_IMPROVEMENT, existing])
+        
+        assert result[0] == HIGH_PRIORITY_IMPROVEMENT.model_dump()
+        assert result[1] is existing
+
+    def test_quality_check_node_with_enhancements(self, base_cv_state):
         """Test quality_check_node with enhanced CV and applied improvements."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[
+        state = {
+            **base_cv_state,
+            "applied_improvements": [
                 Improvement(
                     section="skills",
                     type="content",
@@ -157,99 +122,60 @@ class TestWorkflowFunctions:
                     confidence=0.8
                 )
             ],
-            enhanced_cv="Enhanced CV content",
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
+            "enhanced_cv": "Enhanced CV content"
+        }
         
         result = quality_check_node(state)
         
         assert result["final_quality_score"] == 0.85
         assert result["processing_complete"] is True
-        assert "enhanced_cv" in result
-        assert "applied_improvements" in result
+        assert set(result) == {"final_quality_score", "processing_complete"}
 
-    def test_quality_check_node_without_enhancements(self):
+    def test_quality_check_node_without_enhancements(self, base_cv_state):
         """Test quality_check_node without enhancements."""
-        state = CVState(
-            original_cv="CV content",
-            file_format="txt",
-            target_role=None,
-            target_industry=None,
-            parsed_sections={},
-            raw_text="CV content",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used=None
-        )
-        
-        result = quality_check_node(state)
+        result = quality_check_node(base_cv_state)
         
         assert result["final_quality_score"] == 0.70
         assert result["processing_complete"] is True
+        assert set(result) == {"final_quality_score", "processing_complete"}
 
 
 class TestWorkflowCreation:
     """Test workflow creation and structure."""
 
-    def test_create_cv_improvement_workflow(self):
+    def test_create_cv_improvement_workflow(self, workflow):
         """Test creating the CV improvement workflow."""
-        workflow = create_cv_improvement_workflow()
-        
         # Check that workflow is created
         assert workflow is not None
         
-        # Check that nodes are added (this is implementation-dependent)
-        # We can't easily test the internal structure without accessing private methods
+        # Check that every node is registered
+        assert set(workflow.nodes) == {
+            "parse_cv", "analyze_quality", "match_requirements",
+            "generate_improvements", "apply_improvements", "quality_check"
+        }
 
-    @patch('cv_agent.workflow.create_cv_improvement_workflow')
-    def test_workflow_compilation(self, mock_create_workflow):
+    def test_workflow_compilation(self, mock_workflow):
         """Test that workflow can be compiled."""
-        mock_workflow = MagicMock()
-        mock_workflow.compile.return_value = MagicMock()
-        mock_create_workflow.return_value = mock_workflow
-        
         agent = CVImprovementAgent()
         
         # Check that workflow was created and compiled
-        mock_create_workflow.assert_called_once()
+        workflow_module.create_cv_improvement_workflow.assert_called_once()
         mock_workflow.compile.assert_called_once()
 
 
 class TestCVImprovementAgent:
     """Test the CVImprovementAgent class."""
 
-    @patch('cv_agent.workflow.create_cv_improvement_workflow')
-    def test_agent_initialization(self, mock_create_workflow):
+    def test_agent_initialization(self, mock_app):
         """Test CVImprovementAgent initialization."""
-        mock_workflow = MagicMock()
-        mock_app = MagicMock()
-        mock_workflow.compile.return_value = mock_app
-        mock_create_workflow.return_value = mock_workflow
-        
         agent = CVImprovementAgent()
         
         assert hasattr(agent, 'workflow')
         assert hasattr(agent, 'app')
         assert agent.app == mock_app
 
-    @patch('cv_agent.workflow.create_cv_improvement_workflow')
-    def test_process_cv_with_text_input(self, mock_create_workflow):
+    def test_process_cv_with_text_input(self, mock_app):
         """Test processing CV with text input."""
-        # Mock workflow and app
-        mock_workflow = MagicMock()
-        mock_app = MagicMock()
-        mock_workflow.compile.return_value = mock_app
-        mock_create_workflow.return_value = mock_workflow
-        
         # Mock app.invoke result
         expected_result = {
             "original_cv": "John Doe CV",
@@ -269,38 +195,199 @@ class TestCVImprovementAgent:
         )
         
         # Check that app.invoke was called with correct initial state
-        mock_app.invoke.assert_called_once()
-        call_args = mock_app.invoke.call_args[0][0]
-        
-        assert call_args["original_cv"] == "John Doe CV"
-        assert call_args["target_role"] == "Software Engineer"
-        assert call_args["target_industry"] == "technology"
-        assert call_args["file_format"] == "unknown"
-        assert call_args["model_used"] == "gpt-4o"
+        mock_app.invoke.assert_called_once_with({
+            **dict.fromkeys(INITIAL_STATE_KEYS, ANY),
+            "original_cv": "John Doe CV",
+            "target_role": "Software Engineer",
+            "target_industry": "technology",
+            "file_format": "unknown",
+            "model_used": workflow_module.MODEL_NAME
+        })
         
         assert result == expected_result
 
-    @patch('cv_agent.workflow.create_cv_improvement_workflow')
-    def test_process_cv_with_optional_parameters(self, mock_create_workflow):
+    def test_process_cv_with_optional_parameters(self, mock_app):
         """Test processing CV with optional parameters."""
-        mock_workflow = MagicMock()
-        mock_app = MagicMock()
-        mock_workflow.compile.return_value = mock_app
-        mock_create_workflow.return_value = mock_workflow
-        
         mock_app.invoke.return_value = {"result": "success"}
         
         agent = CVImprovementAgent()
         result = agent.process_cv(cv_input="CV content")  # No target_role or target_industry
         
-        call_args = mock_app.invoke.call_args[0][0]
-        assert call_args["target_role"] is None
-        assert call_args["target_industry"] is None
+        mock_app.invoke.assert_called_once_with({
+            **dict.fromkeys(INITIAL_STATE_KEYS, ANY),
+            "target_role": None,
+            "target_industry": None
+        })
+
+    def test_process_cv_returns_cached_result(self, mock_app):
+        """Test that repeated calls with identical inputs are served from the cache."""
+        mock_app.invoke.return_value = {"result": "success"}
 
-    def test_get_improvement_summary_with_complete_results(self):
-        """Test getting improvement summary with complete results."""
         agent = CVImprovementAgent()
-        
+        first = agent.process_cv(cv_input="CV content", target_role="Software Engineer")
+        second = agent.process_cv(cv_input="CV content", target_role="Software Engineer")
+
+        mock_app.invoke.assert_called_once()
+        assert first == second == {"result": "success"}
+
+        # A different target role is a different cache key
+        agent.process_cv(cv_input="CV content", target_role="Data Scientist")
+        assert mock_app.invoke.call_count == 2
+
+    def test_process_cv_cache_disabled(self, mock_app):
+        """Test that the disabled cache policy always runs the workflow."""
+        mock_app.invoke.return_value = {"result": "success"}
+
+        agent = CVImprovementAgent(cache_policy="disabled")
+        agent.process_cv(cv_input="CV content")
+        agent.process_cv(cv_input="CV content")
+
+        assert mock_app.invoke.call_count == 2
+
+    def test_process_cv_cache_expires(self, mock_app):
+        """Test that cached results older than the TTL are recomputed."""
+        mock_app.invoke.return_value = {"result": "success"}
+
+        agent = CVImprovementAgent(cache_ttl=0)
+        agent.process_cv(cv_input="CV content")
+        agent.process_cv(cv_input="CV content")
+
+        assert mock_app.invoke.call_count == 2
+
+    def test_process_cv_does_not_cache_failed_runs(self, mock_app):
+        """Test that results with processing errors are recomputed on the next call."""
+        mock_app.invoke.return_value = {"processing_errors": ["LLM unavailable"]}
+
+        agent = CVImprovementAgent()
+        agent.process_cv(cv_input="CV content")
+        agent.process_cv(cv_input="CV content")
+
+        assert mock_app.invoke.call_count == 2
+
+    def test_process_cv_cache_evicts_least_recently_used(self, mock_app, monkeypatch):
+        """Test that the result cache keeps at most RESULT_CACHE_MAX_ENTRIES results."""
+        monkeypatch.setattr(workflow_module, "RESULT_CACHE_MAX_ENTRIES", 2)
+        mock_app.invoke.return_value = {"result": "success"}
+
+        agent = CVImprovementAgent()
+        for cv in ("CV one", "CV two", "CV one", "CV three"):
+            agent.process_cv(cv_input=cv)
+        assert len(agent._cache) == 2
+        assert mock_app.invoke.call_count == 3
+
+        # "CV two" was least recently used when "CV three" was stored
+        agent.process_cv(cv_input="CV one")
+        assert mock_app.invoke.call_count == 3
+        agent.process_cv(cv_input="CV two")
+        assert mock_app.invoke.call_count == 4
+
+    def test_process_cv_reuses_parse_for_new_role(self, mock_app):
+        """Test that re-running a CV for another role starts from the cached parse."""
+        mock_app.invoke.return_value = {
+            "raw_text": "John Doe CV",
+            "file_format": "txt",
+            "parsed_sections": {"summary": {"name": "summary", "content": "John Doe CV", "position": 0}}
+        }
+
+        agent = CVImprovementAgent()
+        agent.process_cv(cv_input="CV content", target_role="Software Engineer")
+        assert mock_app.invoke.call_args[0][0]["raw_text"] == ""
+
+        agent.process_cv(cv_input="CV content", target_role="Data Scientist")
+        second_state = mock_app.invoke.call_args[0][0]
+        assert mock_app.invoke.call_count == 2
+        assert second_state["raw_text"] == "John Doe CV"
+        assert second_state["file_format"] == "txt"
+        assert "summary" in second_state["parsed_sections"]
+
+    def test_process_cv_drops_uploaded_bytes(self, mock_app):
+        """Test that results keep the parsed text but not the uploaded file bytes."""
+        mock_app.invoke.return_value = {"raw_bytes": b"John Doe CV", "raw_text": "John Doe CV"}
+
+        agent = CVImprovementAgent()
+        result = agent.process_cv(cv_input=b"John Doe CV", file_format="txt")
+
+        assert result["raw_bytes"] is None
+        assert result["raw_text"] == "John Doe CV"
+
+    def test_process_cv_replay_miss_raises(self, mock_app):
+        """Test that the replay cache policy raises on a cache miss."""
+        agent = CVImprovementAgent(cache_policy="replay")
+
+        with pytest.raises(KeyError):
+            agent.process_cv(cv_input="CV content")
+
+    def test_process_cv_cache_persists_to_disk(self, mock_app, tmp_path):
+        """Test that cached results are shared through the cache directory."""
+        mock_app.invoke.return_value = {"result": "success"}
+
+        CVImprovementAgent(cache_dir=str(tmp_path)).process_cv(cv_input="CV content")
+
+        replay_agent = CVImprovementAgent(cache_policy="replay", cache_dir=str(tmp_path))
+        assert replay_agent.process_cv(cv_input="CV content") == {"result": "success"}
+        mock_app.invoke.assert_called_once()
+
+    def test_process_cv_deletes_expired_cache_files(self, mock_app, tmp_path):
+        """Test that persisted results past the TTL are deleted, not just skipped."""
+        mock_app.invoke.return_value = {"result": "success"}
+        stale_file = tmp_path / "stale.pkl"
+        stale_file.write_bytes(b"")
+        os.utime(stale_file, (0, 0))
+
+        CVImprovementAgent(cache_dir=str(tmp_path)).process_cv(cv_input="CV content")
+        cache_file, = tmp_path.glob("*.pkl")
+        assert not stale_file.exists()
+
+        os.utime(cache_file, (0, 0))
+        CVImprovementAgent(cache_dir=str(tmp_path), cache_policy="read_only").process_cv(cv_input="CV content")
+        assert not cache_file.exists()
+        assert mock_app.invoke.call_count == 2
+
+    def test_stream_cv_yields_node_progress(self, mock_app):
+        """Test that stream_cv reports each node and accumulates the final state."""
+        mock_app.stream.return_value = iter([
+            ("values", {"raw_text": ""}),
+            ("updates", {"parse_cv": {"raw_text": "CV content"}}),
+            ("values", {"raw_text": "CV content"}),
+            ("updates", {"analyze_quality": {"identified_gaps": ["gap1"]}}),
+            ("updates", {"match_requirements": {"identified_gaps": []}}),
+            ("values", {"raw_text": "CV content", "identified_gaps": ["gap1"]}),
+            ("updates", {"quality_check": {"processing_complete": True}}),
+            ("values", {"raw_text": "CV content", "identified_gaps": ["gap1"],
+                        "processing_complete": True}),
+        ])
+
+        agent = CVImprovementAgent()
+        steps = list(agent.stream_cv(cv_input="CV content"))
+
+        assert [node for node, _ in steps] == [
+            "parse_cv", "analyze_quality", "match_requirements", "quality_check"
+        ]
+        final_state = steps[-1][1]
+        assert final_state["raw_text"] == "CV content"
+        assert final_state["identified_gaps"] == ["gap1"]
+        assert final_state["processing_complete"] is True
+
+        # The streamed result is cached for subsequent calls
+        assert agent.process_cv(cv_input="CV content")["processing_complete"] is True
+        mock_app.invoke.assert_not_called()
+
+    def test_default_agent_is_shared(self, mock_workflow, mock_app):
+        """Test that the module-level process_cv reuses one compiled agent."""
+        mock_app.invoke.return_value = {"result": "success"}
+
+        assert workflow_module.process_cv("CV one") == {"result": "success"}
+        assert workflow_module.process_cv("CV two") == {"result": "success"}
+        assert workflow_module.get_default_agent() is workflow_module.get_default_agent()
+        mock_workflow.compile.assert_called_once()
+
+    def test_invalid_cache_policy(self):
+        """Test that an unknown cache policy is rejected."""
+        with pytest.raises(ValueError, match="Unknown cache policy"):
+            CVImprovementAgent(cache_policy="sometimes")
+
+    def test_get_improvement_summary_with_complete_results(self, agent):
+        """Test getting improvement summary with complete results."""
         result = {
             "analysis_scores": {
                 "overall_score": 0.75
@@ -326,10 +413,8 @@ class TestCVImprovementAgent:
         assert "Applied 2 high-priority improvements" in summary
         assert "CV has been improved with better formatting and content" in summary
 
-    def test_get_improvement_summary_with_partial_results(self):
+    def test_get_improvement_summary_with_partial_results(self, agent):
         """Test getting improvement summary with partial results."""
-        agent = CVImprovementAgent()
-        
         result = {
             "analysis_scores": {
                 "overall_score": 0.60
@@ -345,20 +430,16 @@ class TestCVImprovementAgent:
         assert "Missing summary section" in summary
         assert "Processing Issues: 1" in summary
 
-    def test_get_improvement_summary_with_empty_results(self):
+    def test_get_improvement_summary_with_empty_results(self, agent):
         """Test getting improvement summary with empty results."""
-        agent = CVImprovementAgent()
-        
         result = {}
         
         summary = agent.get_improvement_summary(result)
         
         assert summary == "CV analysis completed successfully."
 
-    def test_get_improvement_summary_shows_top_gaps_only(self):
+    def test_get_improvement_summary_shows_top_gaps_only(self, agent):
         """Test that improvement summary shows only top 3 gaps."""
-        agent = CVImprovementAgent()
-        
         result = {
             "identified_gaps": [
                 "Gap 1",
@@ -381,63 +462,52 @@ class TestCVImprovementAgent:
 class TestWorkflowIntegration:
     """Test full workflow integration scenarios."""
 
-    @patch('cv_agent.workflow.parse_cv_node')
-    @patch('cv_agent.workflow.analyze_quality_node')
-    @patch('cv_agent.workflow.match_requirements_node')
-    @patch('cv_agent.workflow.generate_improvements_node')
-    @patch('cv_agent.workflow.apply_improvements_node')
-    def test_workflow_execution_mock(self, mock_apply, mock_generate, mock_match, mock_analyze, mock_parse):
-        """Test workflow execution with mocked nodes."""
-        # This is a simplified test since we can't easily test LangGraph execution
-        # In a real scenario, you'd want integration tests with a test LangGraph setup
+    def test_workflow_execution_mock(self, base_cv_state):
+        """Test running the compiled workflow end to end with mocked nodes."""
+        nodes = {
+            "parse_cv_node": Mock(return_value={"raw_text": "parsed", "parsed_sections": {}}),
+            "analyze_quality_node": Mock(return_value={"analysis_scores": {"overall_score": 0.7}}),
+            "match_requirements_node": Mock(return_value={"identified_gaps": ["gap1"]}),
+            "generate_improvements_node": Mock(return_value={"suggested_improvements": []}),
+            "apply_improvements_node": Mock(return_value={"applied_improvements": []})
+        }
         
-        # Mock each node to return expected state updates
-        mock_parse.return_value = {"raw_text": "parsed", "parsed_sections": {}}
-        mock_analyze.return_value = {"analysis_scores": {"overall_score": 0.7}}
-        mock_match.return_value = {"identified_gaps": ["gap1"]}
-        mock_generate.return_value = {"suggested_improvements": []}
-        mock_apply.return_value = {"applied_improvements": []}
+        # Nodes are bound when the graph is built, so patch before creating it
+        with patch.multiple('cv_agent.workflow', **nodes):
+            result = create_cv_improvement_workflow().compile().invoke(base_cv_state)
         
-        # Test that we can create the workflow (actual execution would require more setup)
-        workflow = create_cv_improvement_workflow()
-        assert workflow is not None
+        # No high-priority improvements, so the run skips apply_improvements
+        nodes["apply_improvements_node"].assert_not_called()
+        assert result["raw_text"] == "parsed"
+        assert result["identified_gaps"] == ["gap1"]
+        assert result["final_quality_score"] == 0.70
+        assert result["processing_complete"] is True
 
-    def test_state_flow_simulation(self):
+    def test_state_flow_simulation(self, base_cv_state):
         """Test simulated state flow through workflow steps."""
         # Simulate the state as it would flow through the workflow
         
         # Initial state
-        initial_state = CVState(
-            original_cv="John Doe CV content",
-            file_format="unknown",
-            target_role="Software Engineer",
-            target_industry="technology",
-            parsed_sections={},
-            raw_text="",
-            analysis_scores=None,
-            identified_gaps=[],
-            suggested_improvements=[],
-            applied_improvements=[],
-            enhanced_cv=None,
-            enhancement_summary=None,
-            processing_errors=[],
-            processing_time=None,
-            model_used="gpt-4o"
-        )
+        initial_state = {
+            **base_cv_state,
+            "original_cv": "John Doe CV content",
+            "target_role": "Software Engineer",
+            "target_industry": "technology"
+        }
         
         # After parsing
-        post_parse_state = initial_state.copy()
-        post_parse_state.update({
+        post_parse_state = {
+            **initial_state,
             "raw_text": "John Doe CV content",
             "file_format": "txt",
             "parsed_sections": {
                 "summary": CVSection(name="summary", content="Developer", position=0, confidence=0.8)
             }
-        })
+        }
         
         # After analysis
-        post_analysis_state = post_parse_state.copy()
-        post_analysis_state.update({
+        post_analysis_state = {
+            **post_parse_state,
             "analysis_scores": AnalysisScore(
                 overall_score=0.7,
                 section_scores={"summary": 0.8},
@@ -446,11 +516,11 @@ class TestWorkflowIntegration:
                 formatting_score=0.8,
                 content_quality=0.75
             )
-        })
+        }
         
         # After improvements
-        post_improvements_state = post_analysis_state.copy()
-        post_improvements_state.update({
+        post_improvements_state = {
+            **post_analysis_state,
             "suggested_improvements": [
                 Improvement(
                     section="summary",
@@ -462,7 +532,7 @@ class TestWorkflowIntegration:
                     confidence=0.9
                 )
             ]
-        })
+        }
         
         # Verify state progression
         assert initial_state["raw_text"] == ""